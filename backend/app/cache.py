@@ -0,0 +1,318 @@
+"""
+Shared Redis cache for serialized API responses.
+
+Enabled by setting REDIS_URL; the client is created by connect() on
+startup. Without it, or when Redis is unreachable, every helper is a no-op
+and callers fall back to the database.
+"""
+import itertools
+import os
+import logging
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple
+
+import orjson
+import redis.asyncio as aioredis
+from redis.exceptions import LockError, RedisError, ResponseError
+
+from .models import GameModeEnum
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Every key carries the same hash tag, so the multi-key scripts and
+# transactions below stay within one slot on Redis Cluster
+KEY_TAG = "{lb}"
+
+# Seconds a serialized leaderboard response lives in Redis
+LEADERBOARD_REDIS_TTL = int(os.getenv("LEADERBOARD_REDIS_TTL", "30"))
+# Bumped on every invalidation, so a response read from the database before
+# an invalidation is never cached after it
+LEADERBOARD_GENERATION_KEY = f"{KEY_TAG}:gen"
+
+# Score submissions are queued here and drained into the database in the
+# background. Entries move to the processing list while a drainer writes them,
+# so a crash mid-batch leaves them there to be requeued; payloads that cannot
+# be parsed are parked on the dead-letter list instead.
+#
+# A queued score has only been acknowledged by Redis, so the queue is opened
+# only when Redis runs with appendonly enabled; otherwise scores are written
+# synchronously.
+SCORE_QUEUE_KEY = f"{KEY_TAG}:queue"
+SCORE_PROCESSING_KEY = f"{KEY_TAG}:queue:processing"
+SCORE_DEAD_LETTER_KEY = f"{KEY_TAG}:queue:dead"
+# Set once the per-mode rank sets hold every stored score
+SCORE_RANKS_READY_KEY = f"{KEY_TAG}:z:ready"
+# Held by the one worker (re)building the rank sets
+SCORE_RANKS_LOCK_KEY = f"{KEY_TAG}:z:seeding"
+SCORE_RANKS_LOCK_TIMEOUT = 120
+
+_redis: Optional[aioredis.Redis] = None
+_ENQUEUE_SCORE = None
+_SET_LEADERBOARD_BODY = None
+# Set by open_score_queue once this process's drainer is ready
+_score_queue_open = False
+
+# Record the score in its mode's rank set and queue it in one atomic step,
+# returning how many scores beat it (nil until the rank sets are seeded).
+_ENQUEUE_SCORE_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+redis.call('ZADD', KEYS[2], ARGV[1], ARGV[2])
+redis.call('LPUSH', KEYS[3], ARGV[3])
+return redis.call('ZCOUNT', KEYS[2], '(' .. ARGV[1], '+inf')
+"""
+
+
+# Cache a leaderboard body only if no invalidation happened since the caller
+# read the generation
+_SET_LEADERBOARD_BODY_LUA = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[3] then
+    return 0
+end
+redis.call('SETEX', KEYS[1], ARGV[1], ARGV[2])
+return 1
+"""
+
+
+def connect() -> None:
+    """Create the Redis client if REDIS_URL is set; connections open on first use."""
+    global _redis, _ENQUEUE_SCORE, _SET_LEADERBOARD_BODY
+    if not REDIS_URL or _redis is not None:
+        return
+    _redis = aioredis.from_url(REDIS_URL)
+    _ENQUEUE_SCORE = _redis.register_script(_ENQUEUE_SCORE_LUA)
+    _SET_LEADERBOARD_BODY = _redis.register_script(_SET_LEADERBOARD_BODY_LUA)
+
+
+def leaderboard_cache_enabled() -> bool:
+    """Whether leaderboard responses are shared through Redis."""
+    return _redis is not None
+
+
+def leaderboard_key(mode: Optional[GameModeEnum]) -> str:
+    """Redis key for the leaderboard of a mode (or all modes)."""
+    return f"{KEY_TAG}:{mode.value if mode else 'all'}"
+
+
+async def get_leaderboard_body(mode: Optional[GameModeEnum]) -> Tuple[Optional[bytes], bytes]:
+    """
+    Return the cached response body for a leaderboard, if any, and the
+    generation to hand back to set_leaderboard_body on a miss.
+    """
+    if _redis is None:
+        return None, b""
+    try:
+        body, generation = await _redis.mget(leaderboard_key(mode), LEADERBOARD_GENERATION_KEY)
+    except RedisError:
+        logger.warning("Redis unavailable, reading leaderboard from database", exc_info=True)
+        return None, b""
+    return body, generation or b""
+
+
+async def set_leaderboard_body(mode: Optional[GameModeEnum], body: bytes, generation: bytes) -> None:
+    """Cache a serialized leaderboard response body read at `generation`."""
+    if _redis is None:
+        return
+    try:
+        await _SET_LEADERBOARD_BODY(
+            keys=[leaderboard_key(mode), LEADERBOARD_GENERATION_KEY],
+            args=[LEADERBOARD_REDIS_TTL, body, generation],
+        )
+    except RedisError:
+        logger.warning("Redis unavailable, leaderboard not cached", exc_info=True)
+
+
+async def invalidate_leaderboard(mode: GameModeEnum) -> None:
+    """Drop the cached leaderboards a new score in `mode` affects."""
+    if _redis is None:
+        return
+    try:
+        pipe = _redis.pipeline(transaction=True)
+        pipe.incr(LEADERBOARD_GENERATION_KEY)
+        pipe.delete(leaderboard_key(None), leaderboard_key(mode))
+        await pipe.execute()
+    except RedisError:
+        logger.warning("Redis unavailable, leaderboard cache not invalidated", exc_info=True)
+
+
+def score_queue_enabled() -> bool:
+    """Whether score submissions are queued in Redis."""
+    return _redis is not None
+
+
+def score_ranks_key(mode: GameModeEnum) -> str:
+    """Redis key of the sorted set ranking every score in a mode."""
+    return f"{KEY_TAG}:z:{mode.value}"
+
+
+async def score_ranks_ready() -> bool:
+    """Whether the rank sets have been seeded from the database."""
+    return _redis is not None and bool(await _redis.exists(SCORE_RANKS_READY_KEY))
+
+
+async def seed_score_ranks(
+    load_rows: Callable[[], Awaitable[Iterable[Tuple[GameModeEnum, str, int]]]],
+    reseed: bool = False,
+    chunk_size: int = 1000,
+) -> bool:
+    """
+    Build the rank sets from the stored (mode, entry id, score) rows.
+
+    Only one worker seeds at a time; returns False if another holds the lock.
+    The sets are emptied first, so a score written directly meanwhile is
+    either among the rows or added by add_score_rank afterwards. Submissions
+    still queued are added from the queue, which is read before the database
+    so none drains out of sight in between. With `reseed`, sets that are
+    already marked ready are rebuilt as well.
+    """
+    lock = _redis.lock(SCORE_RANKS_LOCK_KEY, timeout=SCORE_RANKS_LOCK_TIMEOUT)
+    if not await lock.acquire(blocking=False):
+        return False
+    try:
+        if not reseed and await _redis.exists(SCORE_RANKS_READY_KEY):
+            return True
+        # Submissions write directly until the ready flag is set again
+        await _redis.delete(SCORE_RANKS_READY_KEY, *(score_ranks_key(mode) for mode in GameModeEnum))
+
+        queued = await _redis.lrange(SCORE_QUEUE_KEY, 0, -1)
+        queued += await _redis.lrange(SCORE_PROCESSING_KEY, 0, -1)
+        rows = []
+        for item in queued:
+            try:
+                entry = orjson.loads(item)
+                rows.append((GameModeEnum(entry["mode"]), entry["id"], entry["score"]))
+            except (KeyError, TypeError, ValueError):
+                # Dead-lettered once the drainer reaches it
+                continue
+
+        pipe = _redis.pipeline(transaction=False)
+        pending = 0
+        for mode, entry_id, score in itertools.chain(rows, await load_rows()):
+            pipe.zadd(score_ranks_key(mode), {entry_id: score})
+            pending += 1
+            if pending >= chunk_size:
+                await pipe.execute()
+                pending = 0
+        pipe.set(SCORE_RANKS_READY_KEY, 1)
+        await pipe.execute()
+        return True
+    finally:
+        try:
+            await lock.release()
+        except LockError:
+            logger.warning("Rank set seeding outlived its lock")
+
+
+async def appendonly_enabled() -> bool:
+    """Whether Redis logs writes to its append-only file (False if it won't say)."""
+    try:
+        info = await _redis.info("persistence")
+    except ResponseError:
+        # Managed services may disable INFO; assume the worst
+        logger.warning("Redis persistence settings unavailable", exc_info=True)
+        return False
+    return bool(int(info.get("aof_enabled", 0)))
+
+
+def open_score_queue() -> None:
+    """Start queueing score submissions from this process."""
+    global _score_queue_open
+    _score_queue_open = True
+
+
+async def add_score_rank(mode: GameModeEnum, entry_id: str, score: int) -> bool:
+    """
+    Record a score written directly to the database in its mode's rank set.
+
+    Returns False if Redis could not be updated, leaving the rank sets behind
+    the database.
+    """
+    if _redis is None:
+        return True
+    try:
+        await _redis.zadd(score_ranks_key(mode), {entry_id: score})
+    except RedisError:
+        logger.warning("Redis unavailable, score missing from rank set", exc_info=True)
+        return False
+    return True
+
+
+async def enqueue_score(mode: GameModeEnum, entry_id: str, score: int, payload: bytes) -> Optional[int]:
+    """
+    Queue a serialized score submission and return its projected rank.
+
+    Returns None when the queue is disabled, not seeded yet or Redis is
+    unreachable; the caller then writes the score synchronously.
+    """
+    if _ENQUEUE_SCORE is None or not _score_queue_open:
+        return None
+    try:
+        beaten_by = await _ENQUEUE_SCORE(
+            keys=[SCORE_RANKS_READY_KEY, score_ranks_key(mode), SCORE_QUEUE_KEY],
+            args=[score, entry_id, payload],
+        )
+    except RedisError:
+        logger.warning("Redis unavailable, writing score to database", exc_info=True)
+        return None
+    return None if beaten_by is None else beaten_by + 1
+
+
+async def pop_scores(max_batch: int, timeout: float) -> List[bytes]:
+    """
+    Claim up to `max_batch` queued submissions, oldest first.
+
+    Blocks up to `timeout` seconds for the first one. Claimed items stay in the
+    processing list until acknowledged.
+    """
+    first = await _redis.brpoplpush(SCORE_QUEUE_KEY, SCORE_PROCESSING_KEY, timeout)
+    if first is None:
+        return []
+    pipe = _redis.pipeline(transaction=False)
+    for _ in range(max_batch - 1):
+        pipe.rpoplpush(SCORE_QUEUE_KEY, SCORE_PROCESSING_KEY)
+    return [first] + [item for item in await pipe.execute() if item is not None]
+
+
+async def ack_scores(items: List[bytes]) -> None:
+    """Drop submissions that were written to the database."""
+    pipe = _redis.pipeline(transaction=False)
+    for item in items:
+        pipe.lrem(SCORE_PROCESSING_KEY, 1, item)
+    await pipe.execute()
+
+
+async def requeue_scores(items: List[bytes]) -> None:
+    """Hand claimed submissions back to the queue, to be drained next."""
+    pipe = _redis.pipeline(transaction=True)
+    for item in items:
+        pipe.lrem(SCORE_PROCESSING_KEY, 1, item)
+        pipe.rpush(SCORE_QUEUE_KEY, item)
+    await pipe.execute()
+
+
+async def dead_letter_scores(items: List[bytes]) -> None:
+    """Move claimed submissions that cannot be written to the dead-letter list."""
+    pipe = _redis.pipeline(transaction=True)
+    for item in items:
+        pipe.lrem(SCORE_PROCESSING_KEY, 1, item)
+        pipe.lpush(SCORE_DEAD_LETTER_KEY, item)
+    await pipe.execute()
+
+
+async def requeue_unacked_scores() -> int:
+    """Move submissions left in the processing list by a crashed drainer back to the queue."""
+    moved = 0
+    while await _redis.rpoplpush(SCORE_PROCESSING_KEY, SCORE_QUEUE_KEY) is not None:
+        moved += 1
+    return moved
+
+
+async def close() -> None:
+    """Close the Redis connection pool."""
+    global _redis, _ENQUEUE_SCORE, _SET_LEADERBOARD_BODY, _score_queue_open
+    if _redis is not None:
+        await _redis.aclose()
+    _redis = _ENQUEUE_SCORE = _SET_LEADERBOARD_BODY = None
+    _score_queue_open = False
@@ -2,15 +2,368 @@
 Database access layer using SQLAlchemy.
 Provides a clean interface for database operations.
 """
-import uuid
-import json
+import os
+import asyncio
+import bisect
+import logging
+import time
+import threading
 from datetime import datetime
-from typing import Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from typing import Optional, List, Dict, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, aliased, load_only, raiseload
+from sqlalchemy import desc, and_, or_, bindparam, case, func, select, insert, update
+import msgpack
+import orjson
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from .models import (
+    User as UserModel,
+    LeaderboardEntry as LeaderboardModel,
+    LiveSession,
+    GameModeEnum,
+    generate_uuid,
+)
+from .security import (
+    hash_password,
+    ahash_password,
+    verify_password_cached,
+    averify_password_cached,
+    password_needs_rehash,
+)
+from .db import AsyncSessionLocal
+from . import cache
+
+logger = logging.getLogger(__name__)
+
+# Leaderboard reads are cached per process for a short TTL, keyed by (mode, limit).
+# Score submissions replace the cached lists with merged copies (published lists
+# are never mutated) and bump the generation so in-flight reads never store a
+# result that misses them.
+LEADERBOARD_CACHE_TTL = float(os.getenv("LEADERBOARD_CACHE_TTL", "2"))
+
+_LB_CACHE: Dict[Tuple[Optional[GameModeEnum], int], Tuple[float, List[dict]]] = {}
+_LB_LOCK = threading.Lock()
+_lb_generation = 0
+
+
+def clear_leaderboard_cache() -> None:
+    """Drop all cached leaderboard results."""
+    global _lb_generation
+    with _LB_LOCK:
+        _lb_generation += 1
+        _LB_CACHE.clear()
+
+
+def _insert_into_leaderboard_cache(entry: dict) -> None:
+    """Merge a new entry into every cached leaderboard it belongs to."""
+    global _lb_generation
+    with _LB_LOCK:
+        _lb_generation += 1
+        for key, (ts, entries) in list(_LB_CACHE.items()):
+            mode, limit = key
+            if mode and mode != entry["mode"]:
+                continue
+            # Entries are sorted by descending score, then id
+            idx = bisect.bisect_right(
+                entries, (-entry["score"], entry["id"]), key=lambda e: (-e["score"], e["id"])
+            )
+            if idx >= limit:
+                continue
+            # Only the suffix from the insertion point changes rank; it is
+            # rebuilt from copies because readers copy cached lists unlocked
+            suffix = [dict(entry)] + entries[idx:limit - 1]
+            _LB_CACHE[key] = (ts, entries[:idx] + [
+                {**e, "rank": rank} for rank, e in enumerate(suffix, start=idx + 1)
+            ])
+
+
+# Live-session ticks are write-back buffered: each update replaces the pending
+# state for its session and a background task flushes the batch periodically.
+# Live state is ephemeral, so losing the last interval on a crash is accepted.
+LIVE_FLUSH_INTERVAL = 0.1
+
+_pending_live_updates: Dict[str, Tuple[int, dict, datetime]] = {}
+
+# Core statement so rows for sessions deleted meanwhile are skipped silently
+_live_table = LiveSession.__table__
+_LIVE_UPDATE_STMT = (
+    update(_live_table)
+    .where(_live_table.c.id == bindparam("_id"))
+    .values(
+        score=bindparam("score"),
+        game_state=bindparam("game_state"),
+        last_update=bindparam("last_update"),
+    )
+)
+
+
+async def flush_live_session_updates(session_factory: async_sessionmaker = AsyncSessionLocal) -> int:
+    """Write all pending live-session updates in one executemany UPDATE."""
+    global _pending_live_updates
+    batch, _pending_live_updates = _pending_live_updates, {}
+    if not batch:
+        return 0
+
+    params = [
+        {
+            "_id": session_id,
+            "score": score,
+            "game_state": msgpack.packb(game_state, use_bin_type=True),
+            "last_update": last_update,
+        }
+        for session_id, (score, game_state, last_update) in batch.items()
+    ]
+    try:
+        async with session_factory() as db:
+            await db.execute(_LIVE_UPDATE_STMT, params)
+            await db.commit()
+    except BaseException:
+        # Put the batch back unless a newer update for the session arrived;
+        # this includes cancellation, so shutdown's final flush still has it
+        for session_id, pending in batch.items():
+            _pending_live_updates.setdefault(session_id, pending)
+        raise
+    return len(params)
+
+
+async def run_live_session_flusher(
+    interval: float = LIVE_FLUSH_INTERVAL,
+    session_factory: async_sessionmaker = AsyncSessionLocal,
+) -> None:
+    """Flush pending live-session updates every `interval` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await flush_live_session_updates(session_factory)
+        except Exception:
+            logger.exception("Failed to flush live session updates")
+
+
+# With Redis configured, score submissions are written behind: the request
+# queues the entry and takes its projected rank from the Redis rank sets, and
+# a background drainer batches queued entries into the database. Leaderboard
+# reads are eventually consistent with submissions.
+SCORE_DRAIN_BATCH = 500
+SCORE_DRAIN_TIMEOUT = 1.0
+# Failures back off exponentially from SCORE_DRAIN_RETRY to SCORE_DRAIN_MAX_RETRY
+SCORE_DRAIN_RETRY = 1.0
+SCORE_DRAIN_MAX_RETRY = 30.0
+
+_leaderboard_table = LeaderboardModel.__table__
+
+# Set when a directly written score could not be added to the rank sets; the
+# drainer then rebuilds them from the database
+_score_ranks_stale = False
 
-from .models import User as UserModel, LeaderboardEntry as LeaderboardModel, LiveSession, GameModeEnum
-from .security import hash_password, verify_password
+
+async def queue_score(user: dict, score: int, mode: GameModeEnum) -> Optional[dict]:
+    """
+    Queue a score submission for the background drainer.
+
+    Returns the entry with its projected rank, or None when the queue is not
+    available and the score must be written synchronously.
+    """
+    created_at = datetime.utcnow()
+    entry = {
+        "id": generate_uuid(),
+        "username": user["username"],
+        "score": score,
+        "mode": mode.value,
+        "date": created_at.strftime("%Y-%m-%d"),
+        "avatar": user.get("avatar"),
+    }
+    payload = orjson.dumps({**entry, "user_id": user["id"], "created_at": created_at})
+    rank = await cache.enqueue_score(mode, entry["id"], score, payload)
+    if rank is None:
+        return None
+    _insert_into_leaderboard_cache(entry)
+    return {**entry, "rank": rank}
+
+
+async def record_score_rank(entry: dict, mode: GameModeEnum) -> None:
+    """Add a score written directly to the database to the Redis rank sets."""
+    global _score_ranks_stale
+    if not await cache.add_score_rank(mode, entry["id"], entry["score"]):
+        _score_ranks_stale = True
+
+
+async def flush_queued_scores(
+    session_factory: async_sessionmaker = AsyncSessionLocal,
+    timeout: float = SCORE_DRAIN_TIMEOUT,
+) -> int:
+    """Write one batch of queued score submissions in one executemany INSERT."""
+    items = await cache.pop_scores(SCORE_DRAIN_BATCH, timeout)
+    if not items:
+        return 0
+
+    rows = {}
+    malformed = []
+    for item in items:
+        try:
+            entry = orjson.loads(item)
+            rows[entry["id"]] = {
+                "id": entry["id"],
+                "user_id": entry["user_id"],
+                "username": entry["username"],
+                "score": entry["score"],
+                "mode": GameModeEnum(entry["mode"]),
+                "avatar": entry["avatar"],
+                "created_at": datetime.fromisoformat(entry["created_at"]),
+            }
+        except (KeyError, TypeError, ValueError):
+            malformed.append(item)
+    if malformed:
+        # Retrying would fail the whole batch forever; park them for inspection
+        logger.error("Moving %d malformed queued score(s) to %s", len(malformed), cache.SCORE_DEAD_LETTER_KEY)
+        await cache.dead_letter_scores(malformed)
+        items = [item for item in items if item not in malformed]
+    if not items:
+        return 0
+
+    try:
+        async with session_factory() as db:
+            # Entries requeued after a crash may already have been written
+            stored = await db.execute(
+                select(_leaderboard_table.c.id).where(_leaderboard_table.c.id.in_(list(rows)))
+            )
+            for entry_id in stored.scalars().all():
+                del rows[entry_id]
+            if rows:
+                await db.execute(insert(_leaderboard_table), list(rows.values()))
+                await db.commit()
+    except Exception:
+        await cache.requeue_scores(items)
+        raise
+
+    await cache.ack_scores(items)
+    for mode in {row["mode"] for row in rows.values()}:
+        await cache.invalidate_leaderboard(mode)
+    return len(rows)
+
+
+async def _seed_score_ranks(session_factory: async_sessionmaker, reseed: bool = False) -> bool:
+    async with session_factory() as db:
+        async def load_rows():
+            result = await db.execute(
+                select(LeaderboardModel.mode, LeaderboardModel.id, LeaderboardModel.score)
+            )
+            return result.tuples()
+
+        return await cache.seed_score_ranks(load_rows, reseed=reseed)
+
+
+async def _backoff(exc: Exception, delay: float, message: str) -> float:
+    """Log a drainer failure, sleep `delay` and return the next, longer delay."""
+    if isinstance(exc, RedisConnectionError):
+        logger.warning("%s: Redis unreachable, retrying in %.0fs", message, delay)
+    else:
+        logger.error("%s, retrying in %.0fs", message, delay, exc_info=exc)
+    await asyncio.sleep(delay)
+    return min(delay * 2, SCORE_DRAIN_MAX_RETRY)
+
+
+async def run_score_queue_drainer(session_factory: async_sessionmaker = AsyncSessionLocal) -> None:
+    """Drain queued score submissions into the database until cancelled."""
+    global _score_ranks_stale
+    if not cache.score_queue_enabled():
+        return
+
+    requeued = False
+    delay = SCORE_DRAIN_RETRY
+    while True:
+        try:
+            if not requeued:
+                await cache.requeue_unacked_scores()
+                requeued = True
+            # Another worker may hold the seeding lock; wait for its sets
+            if not (await cache.score_ranks_ready() or await _seed_score_ranks(session_factory)):
+                await asyncio.sleep(SCORE_DRAIN_RETRY)
+                continue
+            # Scores queued before a restart are drained either way, but new
+            # ones are only queued if Redis keeps them across its own restarts
+            if await cache.appendonly_enabled():
+                cache.open_score_queue()
+            else:
+                logger.warning("Redis appendonly is off; score submissions are written synchronously")
+            break
+        except Exception as e:
+            delay = await _backoff(e, delay, "Failed to prepare the score queue")
+    delay = SCORE_DRAIN_RETRY
+    while True:
+        try:
+            if _score_ranks_stale:
+                # Cleared first so a failure reported during the rebuild still counts
+                _score_ranks_stale = False
+                try:
+                    if not await _seed_score_ranks(session_factory, reseed=True):
+                        _score_ranks_stale = True
+                except Exception:
+                    _score_ranks_stale = True
+                    raise
+            await flush_queued_scores(session_factory)
+            delay = SCORE_DRAIN_RETRY
+        except Exception as e:
+            delay = await _backoff(e, delay, "Failed to drain queued scores")
+
+
+# User lookups only need the columns User.to_dict returns; the password hash
+# is loaded solely by the password checks.
+_USER_PUBLIC_COLUMNS = (
+    raiseload('*'),
+    load_only(UserModel.id, UserModel.username, UserModel.email, UserModel.avatar, UserModel.created_at),
+)
+
+
+def _live_sessions_query(status: str):
+    """Select the live-session columns needed for the spectator list."""
+    return select(
+        LiveSession.id,
+        LiveSession.username,
+        LiveSession.score,
+        LiveSession.mode,
+        LiveSession.status,
+        LiveSession.viewers,
+        LiveSession.avatar,
+        LiveSession.game_state,
+    ).where(LiveSession.status == status).order_by(desc(LiveSession.viewers))
+
+
+def _live_session_columns_query(session_id: str):
+    """Select a live session's fixed columns; game_state is about to be replaced."""
+    return select(
+        LiveSession.id,
+        LiveSession.username,
+        LiveSession.mode,
+        LiveSession.status,
+        LiveSession.viewers,
+        LiveSession.avatar,
+    ).where(LiveSession.id == session_id)
+
+
+def _live_session_row_to_dict(row) -> dict:
+    """Build a live-session response dict from a result row."""
+    return {
+        "id": row.id,
+        "username": row.username,
+        "score": row.score,
+        "mode": row.mode.value if isinstance(row.mode, GameModeEnum) else row.mode,
+        "status": row.status,
+        "viewers": row.viewers,
+        "avatar": row.avatar,
+        **(msgpack.unpackb(row.game_state, raw=False) if row.game_state else {}),
+    }
+
+
+def _change_viewers_query(session_id: str, delta: int):
+    """Atomically adjust a session's viewer count (floored at 0) and return the row."""
+    viewers = LiveSession.viewers + delta
+    return (
+        update(LiveSession)
+        .where(LiveSession.id == session_id)
+        .values(viewers=case((viewers < 0, 0), else_=viewers))
+        .returning(LiveSession)
+    )
 
 
 class Database:
@@ -23,17 +376,17 @@ class Database:
     # User operations
     def get_user_by_email(self, email: str) -> Optional[dict]:
         """Get user by email address."""
-        user = self.db.query(UserModel).filter(UserModel.email == email).first()
+        user = self.db.query(UserModel).options(*_USER_PUBLIC_COLUMNS).filter(UserModel.email == email).first()
         return user.to_dict() if user else None
 
     def get_user_by_id(self, user_id: str) -> Optional[dict]:
         """Get user by ID."""
-        user = self.db.query(UserModel).filter(UserModel.id == user_id).first()
+        user = self.db.get(UserModel, user_id, options=_USER_PUBLIC_COLUMNS)
         return user.to_dict() if user else None
 
     def get_user_by_username(self, username: str) -> Optional[dict]:
         """Get user by username."""
-        user = self.db.query(UserModel).filter(UserModel.username == username).first()
+        user = self.db.query(UserModel).options(*_USER_PUBLIC_COLUMNS).filter(UserModel.username == username).first()
         return user.to_dict() if user else None
 
     def create_user(self, username: str, email: str, password: str) -> dict:
@@ -48,7 +401,6 @@ class Database:
                 raise ValueError("Username already taken")
 
             user = UserModel(
-                id=str(uuid.uuid4()),
                 username=username,
                 email=email,
                 password_hash=hash_password(password),
@@ -56,7 +408,6 @@ class Database:
             )
             self.db.add(user)
             self.db.commit()
-            self.db.refresh(user)
             
             return user.to_dict()
         except Exception as e:
@@ -69,166 +420,350 @@ class Database:
         if not user:
             return None
         
-        if not verify_password(password, user.password_hash):
+        if not verify_password_cached(password, user.password_hash):
             return None
         
+        if password_needs_rehash(user.password_hash):
+            user.password_hash = hash_password(password)
+            self.db.commit()
+        
         return user.to_dict()
 
     # Leaderboard operations
-    def get_leaderboard(self, mode: Optional[str] = None, limit: int = 100) -> List[dict]:
-        """Get leaderboard entries, optionally filtered by mode."""
-        query = self.db.query(LeaderboardModel)
+    def get_leaderboard(
+        self,
+        mode: Optional[GameModeEnum] = None,
+        limit: int = 100,
+        after: Optional[Tuple[int, str]] = None,
+        fresh: bool = False,
+    ) -> List[dict]:
+        """
+        Get leaderboard entries, optionally filtered by mode.
+        
+        Entries are ordered by score descending, then id. `after` is the
+        (score, id) of the last entry of the previous page; ranks continue
+        from the number of entries up to it. Only first pages are cached.
+        `fresh` reads past the cache (and refreshes it).
+        """
+        key = (mode, limit)
+        now = time.monotonic()
+        with _LB_LOCK:
+            cached = _LB_CACHE.get(key) if after is None and not fresh else None
+            generation = _lb_generation
+        if cached and now - cached[0] < LEADERBOARD_CACHE_TTL:
+            return [dict(entry) for entry in cached[1]]
+
+        # Project only the needed columns and let the database number the rows
+        order = (LeaderboardModel.score.desc(), LeaderboardModel.id)
+        rank = func.row_number().over(order_by=order)
+        stmt = select(LeaderboardModel.id)
         
         if mode:
-            query = query.filter(LeaderboardModel.mode == GameModeEnum(mode))
+            stmt = stmt.where(LeaderboardModel.mode == mode)
         
-        entries = query.order_by(desc(LeaderboardModel.score)).limit(limit).all()
+        if after is not None:
+            # Seek past the previous page along the (mode, score DESC, id) index
+            after_score, after_id = after
+            stmt = stmt.where(or_(
+                LeaderboardModel.score < after_score,
+                and_(LeaderboardModel.score == after_score, LeaderboardModel.id > after_id),
+            ))
+            # Ranks carry on from the number of entries up to the cursor,
+            # counted now rather than taken from the client
+            earlier = aliased(LeaderboardModel)
+            preceding = select(func.count()).select_from(earlier).where(or_(
+                earlier.score > after_score,
+                and_(earlier.score == after_score, earlier.id <= after_id),
+            ))
+            if mode:
+                preceding = preceding.where(earlier.mode == mode)
+            rank = rank + preceding.scalar_subquery()
         
-        # Add rank to entries
-        result = []
-        for rank, entry in enumerate(entries, start=1):
-            entry_dict = entry.to_dict()
-            entry_dict['rank'] = rank
-            result.append(entry_dict)
+        stmt = stmt.add_columns(
+            LeaderboardModel.username,
+            LeaderboardModel.score,
+            LeaderboardModel.mode,
+            LeaderboardModel.avatar,
+            LeaderboardModel.created_at,
+            rank.label('rank')
+        )
         
-        return result
+        stmt = stmt.order_by(*order).limit(limit)
+        
+        entries = [
+            {
+                "id": row.id,
+                "username": row.username,
+                "score": row.score,
+                "mode": row.mode.value if isinstance(row.mode, GameModeEnum) else row.mode,
+                "date": row.created_at.strftime("%Y-%m-%d") if row.created_at else None,
+                "avatar": row.avatar,
+                "rank": row.rank,
+            }
+            for row in self.db.execute(stmt)
+        ]
+        
+        if after is not None:
+            return entries
+        
+        # Only store the result if no submission invalidated the cache meanwhile
+        with _LB_LOCK:
+            if generation == _lb_generation:
+                _LB_CACHE[key] = (now, entries)
+        
+        return [dict(entry) for entry in entries]
 
-    def submit_score(self, user_id: str, score: int, mode: str) -> dict:
-        """Submit a score to the leaderboard."""
-        user = self.get_user_by_id(user_id)
+    def submit_score(
+        self, user_id: str, score: int, mode: GameModeEnum, user: Optional[dict] = None
+    ) -> dict:
+        """
+        Submit a score to the leaderboard.
+        
+        Callers that already resolved the user (e.g. the authenticated route)
+        pass it as `user` to skip the lookup.
+        """
+        if user is None:
+            user = self.get_user_by_id(user_id)
         if not user:
             raise ValueError("User not found")
 
         entry = LeaderboardModel(
-            id=str(uuid.uuid4()),
             user_id=user_id,
             username=user['username'],
             score=score,
-            mode=GameModeEnum(mode),
+            mode=mode,
             avatar=user.get('avatar'),
             created_at=datetime.utcnow()
         )
         self.db.add(entry)
         self.db.commit()
-        self.db.refresh(entry)
+        _insert_into_leaderboard_cache(entry.to_dict())
         
-        # Get rank
-        rank = self.db.query(LeaderboardModel).filter(
-            and_(
-                LeaderboardModel.mode == GameModeEnum(mode),
-                LeaderboardModel.score > score
+        # Rank within the mode: one plus the number of strictly higher
+        # scores, so ties share the best position. Served by a range scan on
+        # the (mode, score DESC) index.
+        rank = 1 + self.db.execute(
+            select(func.count()).select_from(LeaderboardModel).where(
+                LeaderboardModel.mode == entry.mode,
+                LeaderboardModel.score > entry.score,
             )
-        ).count() + 1
+        ).scalar_one()
         
         result = entry.to_dict()
         result['rank'] = rank
         return result
 
-    def get_user_best_score(self, user_id: str, mode: str) -> Optional[int]:
+    def get_user_best_score(self, user_id: str, mode: GameModeEnum) -> Optional[int]:
         """Get user's best score for a specific mode."""
-        entry = self.db.query(LeaderboardModel).filter(
+        entry = self.db.query(LeaderboardModel).options(raiseload('*')).filter(
             and_(
                 LeaderboardModel.user_id == user_id,
-                LeaderboardModel.mode == GameModeEnum(mode)
+                LeaderboardModel.mode == mode
             )
         ).order_by(desc(LeaderboardModel.score)).first()
         
         return entry.score if entry else None
 
     # Live session operations
-    def create_live_session(self, user_id: str, mode: str) -> dict:
+    def create_live_session(self, user_id: str, mode: GameModeEnum) -> dict:
         """Create a new live gaming session."""
         user = self.get_user_by_id(user_id)
         if not user:
             raise ValueError("User not found")
 
-        # End any existing active sessions for this user
-        self.db.query(LiveSession).filter(
-            and_(
-                LiveSession.user_id == user_id,
-                LiveSession.status == "playing"
-            )
-        ).update({"status": "ended"})
+        # End any existing active sessions and insert the new one in a single
+        # transaction; RETURNING hands back the row without a refresh SELECT.
+        self.db.execute(
+            update(LiveSession).where(
+                and_(
+                    LiveSession.user_id == user_id,
+                    LiveSession.status == "playing"
+                )
+            ).values(status="ended")
+        )
 
-        session = LiveSession(
-            id=str(uuid.uuid4()),
+        session = self.db.execute(insert(LiveSession).values(
             user_id=user_id,
             username=user['username'],
             score=0,
-            mode=GameModeEnum(mode),
+            mode=mode,
             status="playing",
             viewers=0,
             avatar=user.get('avatar'),
-            game_state=json.dumps({
+            game_state=msgpack.packb({
                 "snake": [{"x": 10, "y": 10}, {"x": 9, "y": 10}, {"x": 8, "y": 10}],
                 "food": {"x": 15, "y": 15},
                 "direction": "RIGHT"
-            }),
+            }, use_bin_type=True),
             started_at=datetime.utcnow(),
             last_update=datetime.utcnow()
-        )
-        self.db.add(session)
+        ).returning(LiveSession)).scalar_one()
         self.db.commit()
-        self.db.refresh(session)
         return session.to_dict()
 
     def update_live_session(self, session_id: str, score: int, game_state: dict) -> dict:
         """Update live session with new game state."""
-        session = self.db.query(LiveSession).filter(LiveSession.id == session_id).first()
+        session = self.db.get(LiveSession, session_id)
         if not session:
             raise ValueError("Live session not found")
 
         session.score = score
-        session.game_state = json.dumps(game_state)
+        session.game_state = msgpack.packb(game_state, use_bin_type=True)
         session.last_update = datetime.utcnow()
         self.db.commit()
-        self.db.refresh(session)
         return session.to_dict()
 
     def end_live_session(self, session_id: str) -> dict:
         """End a live gaming session."""
-        session = self.db.query(LiveSession).filter(LiveSession.id == session_id).first()
+        session = self.db.get(LiveSession, session_id)
         if not session:
             raise ValueError("Live session not found")
 
         session.status = "ended"
         self.db.commit()
-        self.db.refresh(session)
         return session.to_dict()
 
     def get_live_sessions(self, status: str = "playing") -> List[dict]:
         """Get all active live gaming sessions."""
-        sessions = self.db.query(LiveSession).filter(
-            LiveSession.status == status
-        ).order_by(desc(LiveSession.viewers)).all()
-        
-        return [session.to_dict() for session in sessions]
+        return [_live_session_row_to_dict(row) for row in self.db.execute(_live_sessions_query(status))]
 
     def get_live_session(self, session_id: str) -> Optional[dict]:
         """Get a specific live session by ID."""
-        session = self.db.query(LiveSession).filter(LiveSession.id == session_id).first()
+        session = self.db.get(LiveSession, session_id, options=[raiseload('*')])
         return session.to_dict() if session else None
 
     def increment_session_viewers(self, session_id: str) -> dict:
         """Increment viewer count for a live session."""
-        session = self.db.query(LiveSession).filter(LiveSession.id == session_id).first()
+        return self._change_viewers(session_id, 1)
+
+    def decrement_session_viewers(self, session_id: str) -> dict:
+        """Decrement viewer count for a live session."""
+        return self._change_viewers(session_id, -1)
+
+    def _change_viewers(self, session_id: str, delta: int) -> dict:
+        """Apply a viewer delta in a single UPDATE ... RETURNING."""
+        session = self.db.execute(_change_viewers_query(session_id, delta)).scalar_one_or_none()
         if not session:
             raise ValueError("Live session not found")
 
-        session.viewers += 1
         self.db.commit()
-        self.db.refresh(session)
         return session.to_dict()
 
-    def decrement_session_viewers(self, session_id: str) -> dict:
+
+class AsyncDatabase:
+    """Async access layer for the high-frequency live-session operations."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize with async database session."""
+        self.db = db
+
+    # User operations
+    async def get_user_by_email(self, email: str) -> Optional[dict]:
+        """Get user by email address."""
+        user = await self.db.scalar(
+            select(UserModel).options(*_USER_PUBLIC_COLUMNS).where(UserModel.email == email).limit(1)
+        )
+        return user.to_dict() if user else None
+
+    async def get_user_by_username(self, username: str) -> Optional[dict]:
+        """Get user by username."""
+        user = await self.db.scalar(
+            select(UserModel).options(*_USER_PUBLIC_COLUMNS).where(UserModel.username == username).limit(1)
+        )
+        return user.to_dict() if user else None
+
+    async def create_user(self, username: str, email: str, password: str) -> dict:
+        """Create a new user, hashing the password off the event loop."""
+        # Check if email already exists
+        if await self.get_user_by_email(email):
+            raise ValueError("Email already registered")
+        
+        # Check if username already exists
+        if await self.get_user_by_username(username):
+            raise ValueError("Username already taken")
+        
+        user = UserModel(
+            username=username,
+            email=email,
+            password_hash=await ahash_password(password),
+            created_at=datetime.utcnow()
+        )
+        self.db.add(user)
+        try:
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        return user.to_dict()
+
+    async def verify_user_password(self, email: str, password: str) -> Optional[dict]:
+        """Verify user password off the event loop and return user if valid."""
+        user = await self.db.scalar(
+            select(UserModel).options(raiseload('*')).where(UserModel.email == email).limit(1)
+        )
+        if not user:
+            return None
+        
+        if not await averify_password_cached(password, user.password_hash):
+            return None
+        
+        if password_needs_rehash(user.password_hash):
+            user.password_hash = await ahash_password(password)
+            await self.db.commit()
+        
+        return user.to_dict()
+
+    # Live session operations
+    async def update_live_session(self, session_id: str, score: int, game_state: dict) -> dict:
+        """
+        Update live session with new game state.
+        
+        The session is looked up, but the write is buffered: only the latest state per session is
+        kept, and run_live_session_flusher writes it (or
+        flush_live_session_updates on shutdown).
+        """
+        row = (await self.db.execute(_live_session_columns_query(session_id))).first()
+        if row is None:
+            raise ValueError("Live session not found")
+
+        _pending_live_updates[session_id] = (score, game_state, datetime.utcnow())
+        return {
+            "id": row.id,
+            "username": row.username,
+            "score": score,
+            "mode": row.mode.value if isinstance(row.mode, GameModeEnum) else row.mode,
+            "status": row.status,
+            "viewers": row.viewers,
+            "avatar": row.avatar,
+            **game_state,
+        }
+
+    async def get_live_sessions(self, status: str = "playing") -> List[dict]:
+        """Get all active live gaming sessions."""
+        result = await self.db.execute(_live_sessions_query(status))
+        return [_live_session_row_to_dict(row) for row in result]
+
+    async def get_live_session(self, session_id: str) -> Optional[dict]:
+        """Get a specific live session by ID."""
+        session = await self.db.get(LiveSession, session_id, options=[raiseload('*')])
+        return session.to_dict() if session else None
+
+    async def increment_session_viewers(self, session_id: str) -> dict:
+        """Increment viewer count for a live session."""
+        return await self._change_viewers(session_id, 1)
+
+    async def decrement_session_viewers(self, session_id: str) -> dict:
         """Decrement viewer count for a live session."""
-        session = self.db.query(LiveSession).filter(LiveSession.id == session_id).first()
+        return await self._change_viewers(session_id, -1)
+
+    async def _change_viewers(self, session_id: str, delta: int) -> dict:
+        """Apply a viewer delta in a single UPDATE ... RETURNING."""
+        result = await self.db.execute(_change_viewers_query(session_id, delta))
+        session = result.scalar_one_or_none()
         if not session:
             raise ValueError("Live session not found")
 
-        session.viewers = max(0, session.viewers - 1)
-        self.db.commit()
-        self.db.refresh(session)
+        await self.db.commit()
         return session.to_dict()
 
 
@@ -255,3 +790,7 @@ def get_database(db_session: Session) -> Database:
     """
     return Database(db_session)
 
+
+def get_async_database(db_session: AsyncSession) -> AsyncDatabase:
+    """Get AsyncDatabase instance for dependency injection."""
+    return AsyncDatabase(db_session)
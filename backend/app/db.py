@@ -3,10 +3,14 @@ Database connection and session management.
 Supports both SQLite (development) and PostgreSQL (production).
 """
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+import sys
+from contextvars import ContextVar
+from sqlalchemy import create_engine, event, insert, inspect, select, text, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import scoped_session, sessionmaker, Session
 from contextlib import contextmanager
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
 
 from .models import Base
 
@@ -20,6 +24,22 @@ DATABASE_URL = os.getenv(
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+# Async driver for the same database, used by the high-frequency live-session paths
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+_url = make_url(DATABASE_URL)
+ASYNC_DATABASE_URL = _url.set(drivername=ASYNC_DRIVERS[_url.get_backend_name()])
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Let readers proceed during writes and cut syscalls on large reads."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB
+    cursor.close()
+
+
 # Create engine with appropriate settings
 if DATABASE_URL.startswith("sqlite"):
     # SQLite-specific settings
@@ -28,23 +48,77 @@ if DATABASE_URL.startswith("sqlite"):
         connect_args={"check_same_thread": False},
         echo=False  # Set to True for SQL debugging
     )
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False)
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
 else:
-    # PostgreSQL settings
+    # PostgreSQL settings. SQL logging and per-checkout pings are opt-in;
+    # connections are recycled before typical proxy idle timeouts instead.
+    SQL_ECHO = os.getenv("SQL_ECHO") == "1"
+    DB_PRE_PING = os.getenv("DB_PRE_PING") == "1"
     engine = create_engine(
         DATABASE_URL,
+        pool_size=20,
+        max_overflow=10,
+        pool_pre_ping=DB_PRE_PING,
+        pool_recycle=1800,
+        echo=SQL_ECHO
+    )
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
         pool_size=10,
         max_overflow=20,
-        pool_pre_ping=True,
-        echo=True  # Enable SQL logging for debugging
+        pool_pre_ping=DB_PRE_PING,
+        pool_recycle=1800,
+        echo=SQL_ECHO
     )
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create session factories
+# Objects keep their loaded state after commit; every column we return is set
+# client-side, so there is nothing to re-fetch.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# One session per request, keyed by a context variable so it follows the
+# request across the event loop and the threadpool.
+_request_scope: ContextVar[Optional[object]] = ContextVar("db_request_scope", default=None)
+ScopedSession = scoped_session(SessionLocal, scopefunc=_request_scope.get)
+
+
+@contextmanager
+def request_session_scope() -> Generator[None, None, None]:
+    """
+    Scope ScopedSession to a request and close its session on exit.
+    
+    Usage:
+        with request_session_scope():
+            response = await call_next(request)
+    """
+    token = _request_scope.set(object())
+    try:
+        yield
+    finally:
+        ScopedSession.remove()
+        _request_scope.reset(token)
 
 
 def init_db():
-    """Initialize database by creating all tables."""
+    """Initialize database by creating all tables and any missing indexes."""
     Base.metadata.create_all(bind=engine)
+    
+    # create_all skips tables that already exist, so indexes added to the
+    # models later are created here
+    with engine.begin() as conn:
+        existing = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            present = {ix["name"] for ix in existing.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in present:
+                    index.create(conn)
+    
+    migrate_game_state_to_msgpack()
 
 
 def drop_db():
@@ -52,20 +126,31 @@ def drop_db():
     Base.metadata.drop_all(bind=engine)
 
 
-def get_db() -> Generator[Session, None, None]:
+def get_db() -> Session:
     """
-    Dependency for FastAPI to get database session.
+    Dependency for FastAPI to get the request's database session.
+    
+    The session is closed by the request middleware, not by the dependency.
     
     Usage:
         @app.get("/users")
         def get_users(db: Session = Depends(get_db)):
             return db.query(User).all()
     """
-    db = SessionLocal()
-    try:
+    return ScopedSession()
+
+
+async def aget_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for FastAPI to get an async database session.
+    
+    Usage:
+        @app.get("/live")
+        async def get_live(db: AsyncSession = Depends(aget_db)):
+            return (await db.execute(select(LiveSession))).scalars().all()
+    """
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 @contextmanager
@@ -84,14 +169,54 @@ def get_db_context() -> Generator[Session, None, None]:
         db.close()
 
 
-def seed_database():
+def migrate_game_state_to_msgpack():
+    """
+    Migrate live_sessions.game_state from JSON text to msgpack.
+    
+    Runs from init_db on every startup; converting the column and rows is a
+    no-op once they are already binary. Returns the number of rows converted.
+    
+    Usage:
+        python -m app.db migrate-game-state
+    """
+    import msgpack
+    import orjson
+    from .models import LiveSession
+    
+    with engine.begin() as conn:
+        columns = {c["name"]: c for c in inspect(conn).get_columns("live_sessions")}
+        if conn.dialect.name == "postgresql" and columns["game_state"]["type"].python_type is str:
+            conn.execute(text(
+                "ALTER TABLE live_sessions ALTER COLUMN game_state "
+                "TYPE bytea USING convert_to(game_state, 'UTF8')"
+            ))
+        
+        rows = conn.execute(select(LiveSession.id, LiveSession.game_state)).all()
+        migrated = 0
+        for session_id, state in rows:
+            if state is None:
+                continue
+            try:
+                decoded = orjson.loads(state)
+            except orjson.JSONDecodeError:
+                continue  # Already msgpack
+            conn.execute(
+                update(LiveSession)
+                .where(LiveSession.id == session_id)
+                .values(game_state=msgpack.packb(decoded, use_bin_type=True))
+            )
+            migrated += 1
+    
+    return migrated
+
+
+def seed_database(session_factory: sessionmaker = SessionLocal):
     """Seed database with initial data for development."""
-    from .models import User, LeaderboardEntry, GameModeEnum
+    from .models import User, LeaderboardEntry, GameModeEnum, generate_uuid
     from .security import hash_password
-    import uuid
     from datetime import datetime, timedelta
     
-    with get_db_context() as db:
+    with session_factory() as db:
         # Check if already seeded
         existing_users = db.query(User).count()
         if existing_users > 0:
@@ -100,35 +225,23 @@ def seed_database():
         
         print("Seeding database...")
         
-        # Create demo users
+        # Create demo users (ids are assigned here so entries can reference them)
         demo_users = [
-            User(
-                id=str(uuid.uuid4()),
-                username="PixelMaster",
-                email="user1@example.com",
-                password_hash=hash_password("password123"),
-                created_at=datetime.utcnow() - timedelta(days=50)
-            ),
-            User(
-                id=str(uuid.uuid4()),
-                username="SnakeKing",
-                email="user2@example.com",
-                password_hash=hash_password("password123"),
-                created_at=datetime.utcnow() - timedelta(days=40)
-            ),
-            User(
-                id=str(uuid.uuid4()),
-                username="NeonViper",
-                email="user3@example.com",
-                password_hash=hash_password("password123"),
-                created_at=datetime.utcnow() - timedelta(days=30)
-            ),
+            {
+                "id": generate_uuid(),
+                "username": username,
+                "email": email,
+                "password_hash": hash_password("password123"),
+                "avatar": None,
+                "created_at": datetime.utcnow() - timedelta(days=days_ago),
+            }
+            for username, email, days_ago in [
+                ("PixelMaster", "user1@example.com", 50),
+                ("SnakeKing", "user2@example.com", 40),
+                ("NeonViper", "user3@example.com", 30),
+            ]
         ]
-        
-        for user in demo_users:
-            db.add(user)
-        
-        db.commit()
+        users_by_name = {user["username"]: user for user in demo_users}
         
         # Create leaderboard entries
         leaderboard_data = [
@@ -138,26 +251,30 @@ def seed_database():
             ("NeonViper", 1750, GameModeEnum.pass_through, 4),
             ("PixelMaster", 1620, GameModeEnum.walls, 3),
         ]
+        leaderboard_entries = [
+            {
+                "user_id": users_by_name[username]["id"],
+                "username": username,
+                "score": score,
+                "mode": mode,
+                "avatar": users_by_name[username]["avatar"],
+                "created_at": datetime.utcnow() - timedelta(days=days_ago),
+            }
+            for username, score, mode, days_ago in leaderboard_data
+        ]
         
-        for username, score, mode, days_ago in leaderboard_data:
-            user = db.query(User).filter(User.username == username).first()
-            if user:
-                entry = LeaderboardEntry(
-                    id=str(uuid.uuid4()),
-                    user_id=user.id,
-                    username=user.username,
-                    score=score,
-                    mode=mode,
-                    avatar=user.avatar,
-                    created_at=datetime.utcnow() - timedelta(days=days_ago)
-                )
-                db.add(entry)
-        
+        # One bulk INSERT per table, committed together
+        db.execute(insert(User), demo_users)
+        db.execute(insert(LeaderboardEntry), leaderboard_entries)
         db.commit()
         print("Database seeded successfully!")
 
 
 if __name__ == "__main__":
+    if sys.argv[1:] == ["migrate-game-state"]:
+        print(f"Migrated {migrate_game_state_to_msgpack()} live session(s) to msgpack")
+        sys.exit(0)
+    
     # Initialize and seed database when run directly
     print("Initializing database...")
     init_db()
@@ -0,0 +1,102 @@
+"""
+Server-sent event feed of live players.
+
+One publisher task per process polls the live sessions and fans each changed
+snapshot out to every subscriber, so database load scales with the refresh
+interval rather than with the number of spectators. The publisher only runs
+while at least one client is subscribed.
+"""
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, Optional, Set, Tuple
+
+import orjson
+
+from .db import AsyncSessionLocal
+from .database import AsyncDatabase
+
+logger = logging.getLogger(__name__)
+
+LIVE_FEED_INTERVAL = 1.0
+LIVE_FEED_KEEPALIVE = 15.0
+
+_subscribers: Set[asyncio.Queue] = set()
+_snapshot: Optional[Tuple[float, bytes]] = None
+_publisher: Optional[asyncio.Task] = None
+
+
+def encode_players(players: list) -> bytes:
+    """Encode the /live/players response envelope."""
+    return orjson.dumps({"success": True, "data": {"players": players}, "error": None})
+
+
+def latest_snapshot() -> Optional[bytes]:
+    """Return the publisher's current snapshot if it is still fresh."""
+    if _snapshot is None or time.monotonic() - _snapshot[0] > LIVE_FEED_INTERVAL * 2:
+        return None
+    return _snapshot[1]
+
+
+def _publish(body: bytes) -> None:
+    global _snapshot
+    changed = _snapshot is None or _snapshot[1] != body
+    _snapshot = (time.monotonic(), body)
+    if not changed:
+        return
+    for queue in _subscribers:
+        # Subscribers only care about the newest snapshot
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(body)
+
+
+async def _fetch_players() -> list:
+    async with AsyncSessionLocal() as db:
+        return await AsyncDatabase(db).get_live_sessions()
+
+
+async def _run_publisher() -> None:
+    global _snapshot, _publisher
+    try:
+        while _subscribers:
+            try:
+                _publish(encode_players(await _fetch_players()))
+            except Exception:
+                logger.exception("Failed to refresh live players feed")
+            await asyncio.sleep(LIVE_FEED_INTERVAL)
+    finally:
+        _snapshot = None
+        _publisher = None
+
+
+async def subscribe() -> AsyncIterator[Optional[bytes]]:
+    """
+    Yield live-player snapshots as they change, or None as a keepalive.
+
+    Usage:
+        async for body in subscribe():
+            ...
+    """
+    global _publisher
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+    _subscribers.add(queue)
+    if _publisher is None:
+        _publisher = asyncio.create_task(_run_publisher())
+    elif _snapshot is not None:
+        queue.put_nowait(_snapshot[1])
+
+    try:
+        while True:
+            try:
+                yield await asyncio.wait_for(queue.get(), LIVE_FEED_KEEPALIVE)
+            except asyncio.TimeoutError:
+                yield None
+    finally:
+        _subscribers.discard(queue)
+
+
+async def close() -> None:
+    """Stop the publisher."""
+    if _publisher is not None:
+        _publisher.cancel()
@@ -1,14 +1,23 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from .routers import auth, leaderboard, live
-from .db import init_db, seed_database
+from . import cache, live_feed
+from .db import init_db, seed_database, async_engine, request_session_scope
+from .database import flush_live_session_updates, run_live_session_flusher, run_score_queue_drainer
+import asyncio
+import orjson
 import traceback
 
+# Static bodies, encoded once
+_HEALTHY_BODY = orjson.dumps({"status": "healthy"})
+_ROOT_BODY = orjson.dumps({"message": "Snake Arena Backend API"})
+
 app = FastAPI(
     title="Snake Arena Backend",
     description="FastAPI backend for Snake Arena Live",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware - must be before other middleware
@@ -22,6 +31,13 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def db_session_middleware(request: Request, call_next):
+    """Give each request its own scoped session and close it at response end."""
+    with request_session_scope():
+        return await call_next(request)
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -30,7 +46,7 @@ async def global_exception_handler(request: Request, exc: Exception):
     print(f"Exception: {exc}")
     traceback.print_exc()
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "success": False,
@@ -56,6 +72,28 @@ async def startup_event():
         print(f"ERROR during startup: {e}")
         traceback.print_exc()
 
+    cache.connect()
+    app.state.live_flusher = asyncio.create_task(run_live_session_flusher())
+    app.state.score_drainer = asyncio.create_task(run_score_queue_drainer())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush buffered live-session state and close pooled async connections."""
+    app.state.live_flusher.cancel()
+    # Scores still queued in Redis are drained after the next start
+    app.state.score_drainer.cancel()
+    # Let a flush cut short by the cancellation put its batch back first
+    await asyncio.gather(app.state.live_flusher, app.state.score_drainer, return_exceptions=True)
+    await live_feed.close()
+    try:
+        await flush_live_session_updates()
+    except Exception as e:
+        print(f"ERROR flushing live sessions on shutdown: {e}")
+        traceback.print_exc()
+    await async_engine.dispose()
+    await cache.close()
+
 
 # Include routers
 app.include_router(auth.router)
@@ -66,10 +104,10 @@ app.include_router(live.router)
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return Response(content=_HEALTHY_BODY, media_type="application/json")
 
 
 @app.get("/")
 async def root():
     """Root endpoint."""
-    return {"message": "Snake Arena Backend API"}
+    return Response(content=_ROOT_BODY, media_type="application/json")
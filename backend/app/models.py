@@ -2,13 +2,20 @@
 SQLAlchemy database models for Snake Arena Live.
 """
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, Text, Index, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, DateTime, LargeBinary, Index, Enum as SQLEnum, text
 from sqlalchemy.ext.declarative import declarative_base
 import enum
+import uuid
+import msgpack
 
 Base = declarative_base()
 
 
+def generate_uuid() -> str:
+    """Generate a string UUID primary key."""
+    return str(uuid.uuid4())
+
+
 class GameModeEnum(str, enum.Enum):
     """Game mode enumeration."""
     walls = "walls"
@@ -19,7 +26,7 @@ class User(Base):
     """User model for authentication and profile."""
     __tablename__ = "users"
 
-    id = Column(String(36), primary_key=True)
+    id = Column(String(36), primary_key=True, default=generate_uuid)
     username = Column(String(50), unique=True, nullable=False, index=True)
     email = Column(String(255), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
@@ -41,7 +48,7 @@ class LeaderboardEntry(Base):
     """Leaderboard entry model."""
     __tablename__ = "leaderboard"
 
-    id = Column(String(36), primary_key=True)
+    id = Column(String(36), primary_key=True, default=generate_uuid)
     user_id = Column(String(36), nullable=False, index=True)
     username = Column(String(50), nullable=False)
     score = Column(Integer, nullable=False, index=True)
@@ -53,6 +60,7 @@ class LeaderboardEntry(Base):
     __table_args__ = (
         Index('idx_leaderboard_score_mode', 'score', 'mode'),
         Index('idx_leaderboard_user_mode', 'user_id', 'mode'),
+        Index('idx_leaderboard_mode_score_id', 'mode', score.desc(), 'id'),
     )
     
     def to_dict(self):
@@ -71,26 +79,33 @@ class LiveSession(Base):
     """Live gaming session for spectator mode."""
     __tablename__ = "live_sessions"
 
-    id = Column(String(36), primary_key=True)
+    id = Column(String(36), primary_key=True, default=generate_uuid)
     user_id = Column(String(36), nullable=False, index=True)
     username = Column(String(50), nullable=False)
     score = Column(Integer, default=0, nullable=False)
     mode = Column(SQLEnum(GameModeEnum), nullable=False)
     status = Column(String(20), default="playing", nullable=False)
     viewers = Column(Integer, default=0, nullable=False)
-    game_state = Column(Text, nullable=True)  # JSON string of snake, food, direction
+    game_state = Column(LargeBinary, nullable=True)  # msgpack of snake, food, direction
     avatar = Column(String(500), nullable=True)
     started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     last_update = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     __table_args__ = (
         Index('idx_live_status', 'status'),
+        # Serve "status='playing' ORDER BY viewers DESC" without a sort step
+        Index(
+            'idx_live_playing_viewers',
+            viewers.desc(),
+            postgresql_where=text("status = 'playing'"),
+        ).ddl_if(dialect='postgresql'),
+        # SQLite cannot match a partial index against a bound status parameter
+        Index('idx_live_status_viewers', 'status', viewers.desc()).ddl_if(dialect='sqlite'),
     )
     
     def to_dict(self):
         """Convert model to dictionary."""
-        import json
-        game_state = json.loads(self.game_state) if self.game_state else {}
+        game_state = msgpack.unpackb(self.game_state, raw=False) if self.game_state else {}
         return {
             "id": self.id,
             "username": self.username,
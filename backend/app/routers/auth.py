@@ -1,27 +1,34 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Response, status
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from datetime import timedelta
+import orjson
 from sqlalchemy.orm import Session
 from ..schemas import (
     LoginCredentials,
     SignupCredentials,
     User,
-    ApiResponse,
     TokenResponse,
 )
-from ..db import get_db
-from ..database import get_database
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db import get_db, aget_db
+from ..database import get_database, get_async_database
 from ..security import (
     hash_password,
     verify_password,
     create_access_token,
     verify_token,
+    cached_token_user,
+    remember_token_user,
+    forget_token,
     ACCESS_TOKEN_EXPIRE_MINUTES,
 )
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 security = HTTPBearer()
 
+# Static envelope, encoded once
+_LOGOUT_OK_BODY = orjson.dumps({"success": True, "data": None, "error": None})
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -29,6 +36,10 @@ def get_current_user(
 ) -> dict:
     """Get current user from token."""
     token = credentials.credentials
+    user = cached_token_user(token)
+    if user is not None:
+        return user
+
     user_id = verify_token(token)
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token")
@@ -38,14 +49,15 @@ def get_current_user(
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
 
+    remember_token_user(token, user)
     return user
 
 
-@router.post("/login", response_model=ApiResponse)
-async def login(credentials: LoginCredentials, db_session: Session = Depends(get_db)):
+@router.post("/login")
+async def login(credentials: LoginCredentials, db_session: AsyncSession = Depends(aget_db)):
     """Login user and return access token."""
-    db = get_database(db_session)
-    user = db.verify_user_password(credentials.email, credentials.password)
+    db = get_async_database(db_session)
+    user = await db.verify_user_password(credentials.email, credentials.password)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
@@ -54,9 +66,9 @@ async def login(credentials: LoginCredentials, db_session: Session = Depends(get
         data={"sub": user["id"]}, expires_delta=access_token_expires
     )
 
-    return ApiResponse(
-        success=True,
-        data={
+    return ORJSONResponse({
+        "success": True,
+        "data": {
             "id": user["id"],
             "username": user["username"],
             "email": user["email"],
@@ -65,16 +77,17 @@ async def login(credentials: LoginCredentials, db_session: Session = Depends(get
             "access_token": access_token,
             "token_type": "bearer",
         },
-    )
+        "error": None,
+    })
 
 
-@router.post("/signup", response_model=ApiResponse)
-async def signup(credentials: SignupCredentials, db_session: Session = Depends(get_db)):
+@router.post("/signup")
+async def signup(credentials: SignupCredentials, db_session: AsyncSession = Depends(aget_db)):
     """Create new user account."""
-    db = get_database(db_session)
+    db = get_async_database(db_session)
     
     try:
-        user = db.create_user(
+        user = await db.create_user(
             username=credentials.username,
             email=credentials.email,
             password=credentials.password,
@@ -87,9 +100,9 @@ async def signup(credentials: SignupCredentials, db_session: Session = Depends(g
         data={"sub": user["id"]}, expires_delta=access_token_expires
     )
 
-    return ApiResponse(
-        success=True,
-        data={
+    return ORJSONResponse({
+        "success": True,
+        "data": {
             "id": user["id"],
             "username": user["username"],
             "email": user["email"],
@@ -98,25 +111,31 @@ async def signup(credentials: SignupCredentials, db_session: Session = Depends(g
             "access_token": access_token,
             "token_type": "bearer",
         },
-    )
+        "error": None,
+    })
 
 
-@router.get("/me", response_model=ApiResponse)
+@router.get("/me")
 async def get_current_user_info(user: dict = Depends(get_current_user)):
     """Get current logged in user."""
-    return ApiResponse(
-        success=True,
-        data={
+    return ORJSONResponse({
+        "success": True,
+        "data": {
             "id": user["id"],
             "username": user["username"],
             "email": user["email"],
             "avatar": user.get("avatar"),
             "createdAt": user.get("createdAt"),
         },
-    )
+        "error": None,
+    })
 
 
-@router.post("/logout", response_model=ApiResponse)
-async def logout(user: dict = Depends(get_current_user)):
+@router.post("/logout")
+async def logout(
+    user: dict = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+):
     """Logout user (token is invalidated client-side)."""
-    return ApiResponse(success=True, data=None)
+    forget_token(credentials.credentials)
+    return Response(content=_LOGOUT_OK_BODY, media_type="application/json")
@@ -1,26 +1,75 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from typing import Optional, Tuple
+import orjson
 from sqlalchemy.orm import Session
-from ..schemas import ApiResponse, LeaderboardEntry, GameMode
+from ..schemas import LeaderboardEntry, GameMode
 from ..db import get_db
-from ..database import get_database
+from ..database import get_database, queue_score, record_score_rank
+from .. import cache
 from ..routers.auth import get_current_user
+from ..models import GameModeEnum
 
 router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
 
+LEADERBOARD_PAGE_SIZE = 100
+LEADERBOARD_MAX_PAGE_SIZE = 200
+
+
+def _encode_cursor(entry: dict) -> str:
+    """Cursor pointing after `entry`: "<score>:<id>"."""
+    return f"{entry['score']}:{entry['id']}"
+
+
+def _decode_cursor(cursor: str) -> Tuple[int, str]:
+    """Parse a cursor into the (score, id) get_leaderboard expects."""
+    try:
+        score, entry_id = cursor.split(":", 1)
+        return int(score), entry_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("")
+async def get_leaderboard(
+    mode: Optional[GameModeEnum] = Query(None),
+    limit: int = Query(LEADERBOARD_PAGE_SIZE, ge=1, le=LEADERBOARD_MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    db_session: Session = Depends(get_db),
+):
+    """Get a page of leaderboard entries, optionally filtered by game mode."""
+    # Only the default first page is shared through Redis
+    cacheable = after is None and limit == LEADERBOARD_PAGE_SIZE and cache.leaderboard_cache_enabled()
+    if cacheable:
+        body, generation = await cache.get_leaderboard_body(mode)
+        if body is not None:
+            return Response(content=body, media_type="application/json")
+
+    cursor = _decode_cursor(after) if after is not None else None
 
-@router.get("", response_model=ApiResponse)
-async def get_leaderboard(mode: Optional[str] = Query(None), db_session: Session = Depends(get_db)):
-    """Get leaderboard entries, optionally filtered by game mode."""
     try:
         db = get_database(db_session)
-        entries = db.get_leaderboard(mode=mode)
-        return ApiResponse(success=True, data={"entries": entries})
+        # What goes into Redis is served cluster-wide, so it is read from the
+        # database rather than this process's short-lived cache
+        entries = await run_in_threadpool(
+            db.get_leaderboard, mode=mode, limit=limit, after=cursor, fresh=cacheable
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    next_cursor = _encode_cursor(entries[-1]) if len(entries) == limit else None
+    body = orjson.dumps({
+        "success": True,
+        "data": {"entries": entries, "next_cursor": next_cursor},
+        "error": None,
+    })
+    if cacheable:
+        await cache.set_leaderboard_body(mode, body, generation)
+    return Response(content=body, media_type="application/json")
+
 
-@router.post("/submit", response_model=ApiResponse)
+@router.post("/submit")
 async def submit_score(
     score: int, mode: str, user: dict = Depends(get_current_user), db_session: Session = Depends(get_db)
 ):
@@ -28,14 +77,25 @@ async def submit_score(
     if score < 0:
         raise HTTPException(status_code=400, detail="Score cannot be negative")
 
-    if mode not in ["walls", "pass-through"]:
+    try:
+        game_mode = GameModeEnum(mode)
+    except ValueError:
         raise HTTPException(status_code=400, detail="Invalid game mode")
 
-    try:
-        db = get_database(db_session)
-        entry = db.submit_score(user_id=user["id"], score=score, mode=mode)
-        return ApiResponse(success=True, data=entry)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Queued submissions reach the database (and invalidate the cached
+    # leaderboards) when the background drainer writes them
+    entry = await queue_score(user, score, game_mode)
+    if entry is None:
+        try:
+            db = get_database(db_session)
+            entry = await run_in_threadpool(
+                db.submit_score, user_id=user["id"], score=score, mode=game_mode, user=user
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+        await record_score_rank(entry, game_mode)
+        await cache.invalidate_leaderboard(game_mode)
+    return ORJSONResponse({"success": True, "data": entry, "error": None})
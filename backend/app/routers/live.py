@@ -1,33 +1,55 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from contextlib import aclosing
 from typing import Optional
-from sqlalchemy.orm import Session
-from ..schemas import ApiResponse, LivePlayer
-from ..db import get_db
-from ..database import get_database
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db import aget_db
+from ..database import get_async_database
+from .. import live_feed
 
 router = APIRouter(prefix="/live", tags=["live"])
 
 
-@router.get("/players", response_model=ApiResponse)
-async def get_live_players(db_session: Session = Depends(get_db)):
+@router.get("/players")
+async def get_live_players(db_session: AsyncSession = Depends(aget_db)):
     """Get list of currently live players."""
-    try:
-        db = get_database(db_session)
-        players = db.get_live_sessions()
-        return ApiResponse(success=True, data={"players": players})
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # While spectators are subscribed, the feed's snapshot is at most a refresh old
+    body = live_feed.latest_snapshot()
+    if body is None:
+        try:
+            db = get_async_database(db_session)
+            body = live_feed.encode_players(await db.get_live_sessions())
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/players/stream")
+async def stream_live_players():
+    """Stream the live players list as server-sent events whenever it changes."""
+    async def events():
+        # Close the subscription with the response so the publisher sees the
+        # client leave right away
+        async with aclosing(live_feed.subscribe()) as feed:
+            async for body in feed:
+                yield b": keepalive\n\n" if body is None else b"data: " + body + b"\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
-@router.get("/players/{player_id}", response_model=ApiResponse)
-async def get_player_stream(player_id: str, db_session: Session = Depends(get_db)):
+@router.get("/players/{player_id}")
+async def get_player_stream(player_id: str, db_session: AsyncSession = Depends(aget_db)):
     """Get stream data for a specific player."""
     try:
-        db = get_database(db_session)
-        player = db.get_live_session(session_id=player_id)
+        db = get_async_database(db_session)
+        player = await db.get_live_session(session_id=player_id)
         if not player:
             raise HTTPException(status_code=404, detail="Player not found")
-        return ApiResponse(success=True, data=player)
+        return ORJSONResponse({"success": True, "data": player, "error": None})
     except HTTPException:
         raise
     except Exception as e:
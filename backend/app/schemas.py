@@ -1,7 +1,7 @@
 from enum import Enum
 from typing import Optional
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator
 
 
 class Direction(str, Enum):
@@ -30,9 +30,17 @@ class User(BaseModel):
 
 
 class LoginCredentials(BaseModel):
-    email: EmailStr
+    # The user lookup is the real check, so login skips email-validator
+    email: str = Field(max_length=255)
     password: str
 
+    @field_validator("email")
+    @classmethod
+    def lowercase_domain(cls, email: str) -> str:
+        # Match the domain normalisation EmailStr applied at signup
+        local, at, domain = email.rpartition("@")
+        return f"{local}{at}{domain.lower()}" if at else email
+
 
 class SignupCredentials(BaseModel):
     username: str
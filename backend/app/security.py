@@ -1,7 +1,16 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Tuple
+import asyncio
 import os
-from jose import JWTError, jwt
+import hashlib
+import secrets
+import threading
+import time
+from jose import JWTError, jwk, jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 import bcrypt
 
 
@@ -9,24 +18,119 @@ SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# HMAC key (cryptography/OpenSSL backend) built once; given the raw secret,
+# jose would try to parse it as a JWK and rebuild the key on every call
+_SIGNING_KEY = jwk.construct(SECRET_KEY, ALGORITHM)
+
+# Verified tokens map to (user_id, exp, user, user_expires) so repeat calls
+# skip the base64, HMAC and JSON work. get_current_user also parks the
+# resolved user on the entry for up to TOKEN_USER_TTL seconds to skip the user
+# lookup. Keys are BLAKE2b fingerprints of the token; least recently used
+# entries are evicted first.
+TOKEN_CACHE_MAXSIZE = 10_000
+TOKEN_USER_TTL = 60.0
+
+_TOKEN_CACHE: "OrderedDict[bytes, Tuple[str, float, Optional[dict], float]]" = OrderedDict()
+_TOKEN_LOCK = threading.Lock()
+
+# Successful bcrypt verifications are remembered briefly so rapid re-auth
+# (e.g. reconnects) skips the KDF. Keys hold the stored hash and a SHA-256
+# digest of the password, never the plaintext.
+VERIFY_CACHE_TTL = 30.0
+VERIFY_CACHE_MAXSIZE = 1024
+
+_VERIFY_CACHE: Dict[Tuple[str, bytes], float] = {}
+_VERIFY_LOCK = threading.Lock()
+
+# Both KDFs release the GIL, so async callers hash on a dedicated pool instead
+# of blocking the event loop
+_HASH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="password-hash")
+
+# New passwords are hashed with argon2id (OWASP minimum profile, roughly 10x
+# cheaper than bcrypt's default cost). bcrypt hashes from before the switch
+# still verify and are replaced on the next successful login.
+_ARGON2 = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+_ARGON2_PREFIX = "$argon2"
+
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt directly."""
-    # Bcrypt has a 72-byte limit
-    password_bytes = password.encode('utf-8')[:72]
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
-    return hashed.decode('utf-8')
+    """Hash a password using argon2id."""
+    return _ARGON2.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a bcrypt hash."""
+    """Verify a password against an argon2id or legacy bcrypt hash."""
+    if hashed_password.startswith(_ARGON2_PREFIX):
+        try:
+            return _ARGON2.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+
     # Bcrypt has a 72-byte limit
     password_bytes = plain_password.encode('utf-8')[:72]
     hashed_bytes = hashed_password.encode('utf-8')
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash is bcrypt or uses outdated argon2 parameters."""
+    if not hashed_password.startswith(_ARGON2_PREFIX):
+        return True
+    return _ARGON2.check_needs_rehash(hashed_password)
+
+
+def _verify_cache_key(plain_password: str, hashed_password: str) -> Tuple[str, bytes]:
+    return (hashed_password, hashlib.sha256(plain_password.encode('utf-8')).digest())
+
+
+def _verify_cache_hit(key: Tuple[str, bytes]) -> bool:
+    with _VERIFY_LOCK:
+        expires = _VERIFY_CACHE.get(key)
+    return expires is not None and expires > time.monotonic()
+
+
+def _verify_cache_store(key: Tuple[str, bytes]) -> None:
+    with _VERIFY_LOCK:
+        if len(_VERIFY_CACHE) >= VERIFY_CACHE_MAXSIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            _VERIFY_CACHE.pop(next(iter(_VERIFY_CACHE)))
+        _VERIFY_CACHE.pop(key, None)
+        _VERIFY_CACHE[key] = time.monotonic() + VERIFY_CACHE_TTL
+
+
+def verify_password_cached(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password, reusing a recent successful verification if present."""
+    key = _verify_cache_key(plain_password, hashed_password)
+    if _verify_cache_hit(key):
+        return True
+
+    if not verify_password(plain_password, hashed_password):
+        return False
+
+    _verify_cache_store(key)
+    return True
+
+
+async def ahash_password(password: str) -> str:
+    """Hash a password on the hashing thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_HASH_POOL, hash_password, password)
+
+
+async def averify_password_cached(plain_password: str, hashed_password: str) -> bool:
+    """Async verify_password_cached; bcrypt runs on the hashing thread pool."""
+    key = _verify_cache_key(plain_password, hashed_password)
+    if _verify_cache_hit(key):
+        return True
+
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(_HASH_POOL, verify_password, plain_password, hashed_password):
+        return False
+
+    _verify_cache_store(key)
+    return True
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -34,17 +138,73 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    # A unique id keeps tokens minted in the same second apart
+    to_encode.update({"exp": expire, "jti": secrets.token_urlsafe(16)})
+    encoded_jwt = jwt.encode(to_encode, _SIGNING_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def token_fingerprint(token: str) -> bytes:
+    """Short digest identifying a token without keeping the token itself."""
+    return hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
+
+
 def verify_token(token: str) -> Optional[str]:
+    key = token_fingerprint(token)
+    with _TOKEN_LOCK:
+        hit = _TOKEN_CACHE.get(key)
+        if hit is not None:
+            if hit[1] > time.time():
+                _TOKEN_CACHE.move_to_end(key)
+                return hit[0]
+            del _TOKEN_CACHE[key]
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, _SIGNING_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
             return None
-        return user_id
     except JWTError:
         return None
+
+    exp = payload.get("exp")
+    if exp is not None:
+        with _TOKEN_LOCK:
+            _TOKEN_CACHE[key] = (user_id, exp, None, 0.0)
+            if len(_TOKEN_CACHE) > TOKEN_CACHE_MAXSIZE:
+                _TOKEN_CACHE.popitem(last=False)
+    return user_id
+
+
+def cached_token_user(token: str) -> Optional[dict]:
+    """The user last resolved for a verified token, if still fresh."""
+    key = token_fingerprint(token)
+    with _TOKEN_LOCK:
+        hit = _TOKEN_CACHE.get(key)
+        if hit is None or hit[2] is None:
+            return None
+        if hit[3] <= time.monotonic() or hit[1] <= time.time():
+            return None
+        _TOKEN_CACHE.move_to_end(key)
+        return dict(hit[2])
+
+
+def remember_token_user(token: str, user: dict) -> None:
+    """Park the resolved user on a token verify_token has just cached."""
+    key = token_fingerprint(token)
+    with _TOKEN_LOCK:
+        hit = _TOKEN_CACHE.get(key)
+        if hit is not None:
+            _TOKEN_CACHE[key] = (hit[0], hit[1], dict(user), time.monotonic() + TOKEN_USER_TTL)
+
+
+def forget_token(token: str) -> None:
+    """Drop a token from the verified-token cache."""
+    with _TOKEN_LOCK:
+        _TOKEN_CACHE.pop(token_fingerprint(token), None)
+
+
+def clear_token_cache() -> None:
+    """Drop all cached tokens."""
+    with _TOKEN_LOCK:
+        _TOKEN_CACHE.clear()
@@ -12,11 +12,12 @@ if __name__ == "__main__":
     host = os.getenv("API_HOST", "0.0.0.0")
     port = int(os.getenv("API_PORT", "8000"))
     workers = int(os.getenv("API_WORKERS", "1"))
+    reload = os.getenv("API_RELOAD") == "1"  # Auto-reload for development only
 
     uvicorn.run(
         "app.main:app",
         host=host,
         port=port,
         workers=workers,
-        reload=True,  # Enable auto-reload for development
+        reload=reload,
     )
@@ -0,0 +1,151 @@
+"""
+API test configuration and fixtures.
+The seeded schema is built once per run; each test's sync-session work is
+rolled back through a SAVEPOINT instead of re-seeding.
+"""
+import os
+import bcrypt
+import msgpack
+import pytest
+from sqlalchemy import create_engine, delete, event
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.main import app
+from app.models import Base, GameModeEnum, LiveSession, User
+from app.db import get_db, aget_db, seed_database
+from app.database import clear_leaderboard_cache
+from app.security import clear_token_cache
+
+TEST_DATABASE_URL = "sqlite:///./test_api.db"
+TEST_ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./test_api.db"
+
+test_engine = create_engine(
+    TEST_DATABASE_URL,
+    connect_args={"check_same_thread": False}
+)
+
+
+# pysqlite manages transactions itself and breaks SAVEPOINTs; take over BEGIN
+@event.listens_for(test_engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+    # As in the app: the test transaction's reads must not block writes
+    # committed by async sessions and fixtures
+    dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+
+@event.listens_for(test_engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+# Each TestClient request runs on its own event loop, so async sessions get a
+# fresh connection per request and their writes are not rolled back; tests
+# that write through them (signup) use unique data.
+test_async_engine = create_async_engine(TEST_ASYNC_DATABASE_URL, poolclass=NullPool)
+TestAsyncSessionLocal = async_sessionmaker(
+    test_async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+async def aget_test_db() -> AsyncSession:
+    """Override async database dependency for testing."""
+    async with TestAsyncSessionLocal() as db:
+        yield db
+
+
+def _seed_live_sessions(session_factory: sessionmaker) -> None:
+    """Add the live sessions the spectator tests watch."""
+    with session_factory() as db:
+        db.add_all([
+            LiveSession(
+                id=session_id,
+                user_id=session_id,
+                username=username,
+                score=score,
+                mode=mode,
+                status="playing",
+                viewers=viewers,
+                game_state=msgpack.packb({
+                    "snake": [{"x": 10, "y": 10}, {"x": 9, "y": 10}, {"x": 8, "y": 10}],
+                    "food": food,
+                    "direction": direction,
+                }, use_bin_type=True),
+            )
+            for session_id, username, score, mode, viewers, food, direction in [
+                ("live1", "StreamerPro", 340, GameModeEnum.walls, 42, {"x": 10, "y": 10}, "RIGHT"),
+                ("live2", "NightOwl", 180, GameModeEnum.pass_through, 28, {"x": 15, "y": 5}, "UP"),
+            ]
+        ])
+        db.commit()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def seeded_database():
+    """Create and seed the test schema once per run; yields the engine."""
+    Base.metadata.drop_all(bind=test_engine)
+    Base.metadata.create_all(bind=test_engine)
+    session_factory = sessionmaker(autoflush=False, expire_on_commit=False, bind=test_engine)
+    seed_database(session_factory)
+    _seed_live_sessions(session_factory)
+    app.dependency_overrides[aget_db] = aget_test_db
+    yield test_engine
+    app.dependency_overrides.pop(aget_db, None)
+    test_engine.dispose()
+    for path in ("test_api.db", "test_api.db-wal", "test_api.db-shm"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@pytest.fixture(autouse=True)
+def db_session(seeded_database):
+    """Run each test inside a transaction that is rolled back afterwards."""
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    # Route commits to a SAVEPOINT so the outer transaction can undo them
+    session = Session(
+        bind=connection,
+        autoflush=False,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+    app.dependency_overrides[get_db] = lambda: session
+    
+    yield session
+    
+    app.dependency_overrides.pop(get_db, None)
+    session.close()
+    transaction.rollback()
+    connection.close()
+    clear_leaderboard_cache()
+    clear_token_cache()
+
+
+@pytest.fixture
+def async_session_factory():
+    """Async sessions on the test database; their writes are committed."""
+    return TestAsyncSessionLocal
+
+
+@pytest.fixture
+def bcrypt_user(seeded_database):
+    """A committed user whose password hash predates the argon2id switch."""
+    credentials = {"email": "legacy@example.com", "password": "legacy-pass"}
+    # Committed outside the test transaction so the async login can see it
+    with Session(seeded_database) as db:
+        db.add(User(
+            username="LegacyPlayer",
+            email=credentials["email"],
+            password_hash=bcrypt.hashpw(
+                credentials["password"].encode("utf-8"), bcrypt.gensalt(rounds=4)
+            ).decode("utf-8"),
+        ))
+        db.commit()
+    
+    yield credentials
+    
+    with Session(seeded_database) as db:
+        db.execute(delete(User).where(User.email == credentials["email"]))
+        db.commit()
@@ -1,26 +1,20 @@
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import select
 from app.main import app
-from app.database import db
+from app.models import User
+from app.security import verify_password
 
 
-@pytest.fixture(autouse=True)
-def reset_db():
-    """Reset database before each test."""
-    db.reset()
-    yield
-    db.reset()
-
-
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
-    """Create test client."""
+    """Create test client shared by all tests (DB state is rolled back per test)."""
     return TestClient(app)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def auth_token(client):
-    """Get authentication token for testing."""
+    """Get authentication token for the seeded user, once per module."""
     response = client.post(
         "/auth/login",
         json={"email": "user1@example.com", "password": "password123"},
@@ -55,6 +49,18 @@ class TestAuthEndpoints:
         )
         assert response.status_code == 401
 
+    def test_login_rehashes_bcrypt_password(self, client, bcrypt_user, seeded_database):
+        response = client.post("/auth/login", json=bcrypt_user)
+        assert response.status_code == 200
+
+        with seeded_database.connect() as conn:
+            stored = conn.execute(
+                select(User.password_hash).where(User.email == bcrypt_user["email"])
+            ).scalar_one()
+        assert stored.startswith("$argon2id$")
+        assert verify_password(bcrypt_user["password"], stored)
+        assert client.post("/auth/login", json=bcrypt_user).status_code == 200
+
     def test_signup_success(self, client):
         response = client.post(
             "/auth/signup",
@@ -94,7 +100,7 @@ class TestAuthEndpoints:
 
     def test_get_current_user_no_token(self, client):
         response = client.get("/auth/me")
-        assert response.status_code == 403
+        assert response.status_code == 401
 
     def test_get_current_user_invalid_token(self, client):
         response = client.get(
@@ -109,6 +115,17 @@ class TestAuthEndpoints:
         assert response.status_code == 200
         assert response.json()["success"] is True
 
+    def test_login_after_logout(self, client, auth_token):
+        client.post("/auth/logout", headers={"Authorization": f"Bearer {auth_token}"})
+
+        response = client.post(
+            "/auth/login",
+            json={"email": "user1@example.com", "password": "password123"},
+        )
+        token = response.json()["data"]["access_token"]
+        assert token != auth_token
+        assert client.get("/auth/me", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+
 
 # Leaderboard Tests
 class TestLeaderboardEndpoints:
@@ -148,7 +165,7 @@ class TestLeaderboardEndpoints:
 
     def test_submit_score_no_auth(self, client):
         response = client.post("/leaderboard/submit?score=500&mode=walls")
-        assert response.status_code == 403
+        assert response.status_code == 401
 
     def test_submit_score_invalid_mode(self, client, auth_token):
         response = client.post(
@@ -171,6 +188,58 @@ class TestLeaderboardEndpoints:
         scores = [e["score"] for e in entries]
         assert scores == sorted(scores, reverse=True)
 
+    def test_leaderboard_pages_are_continuous(self, client):
+        full = client.get("/leaderboard").json()["data"]["entries"]
+        assert len(full) == 5
+
+        first = client.get("/leaderboard?limit=2").json()["data"]
+        second = client.get(f"/leaderboard?limit=2&after={first['next_cursor']}").json()["data"]
+        last = client.get(f"/leaderboard?limit=2&after={second['next_cursor']}").json()["data"]
+
+        pages = first["entries"] + second["entries"] + last["entries"]
+        assert [e["id"] for e in pages] == [e["id"] for e in full]
+        assert [e["rank"] for e in second["entries"]] == [3, 4]
+        assert [e["rank"] for e in pages] == [1, 2, 3, 4, 5]
+        assert last["next_cursor"] is None
+
+    def test_leaderboard_ties_broken_by_id(self, client, auth_token):
+        for _ in range(3):
+            response = client.post(
+                "/leaderboard/submit?score=3000&mode=walls",
+                headers={"Authorization": f"Bearer {auth_token}"},
+            )
+            assert response.status_code == 200
+
+        first = client.get("/leaderboard?mode=walls&limit=2").json()["data"]
+        second = client.get(f"/leaderboard?mode=walls&limit=2&after={first['next_cursor']}").json()["data"]
+
+        tied = first["entries"] + second["entries"][:1]
+        assert [e["score"] for e in tied] == [3000, 3000, 3000]
+        assert [e["id"] for e in tied] == sorted(e["id"] for e in tied)
+        assert [e["rank"] for e in tied] == [1, 2, 3]
+        assert second["entries"][1]["score"] == 2450
+
+    def test_leaderboard_ranks_counted_on_read(self, client, auth_token):
+        first = client.get("/leaderboard?limit=2").json()["data"]
+        response = client.post(
+            "/leaderboard/submit?score=99999&mode=walls",
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        assert response.status_code == 200
+
+        second = client.get(f"/leaderboard?limit=2&after={first['next_cursor']}").json()["data"]
+        # The new top score pushes everything after the cursor down one place
+        assert [e["rank"] for e in second["entries"]] == [4, 5]
+
+    def test_leaderboard_malformed_cursor(self, client):
+        response = client.get("/leaderboard?after=not-a-cursor")
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize("limit", [0, 201])
+    def test_leaderboard_limit_out_of_range(self, client, limit):
+        response = client.get(f"/leaderboard?limit={limit}")
+        assert response.status_code == 422
+
 
 # Live Players Tests
 class TestLivePlayersEndpoints:
@@ -1,147 +1,176 @@
 import pytest
-from app.database import MockDatabase
+from app.database import Database, _LB_CACHE
+from app.models import GameModeEnum, LeaderboardEntry
 
 
 @pytest.fixture
-def mock_db():
-    """Create a fresh mock database for testing."""
-    db = MockDatabase()
-    return db
+def database(db_session):
+    """Database layer over the test's rolled-back session."""
+    return Database(db_session)
 
 
-class TestMockDatabase:
-    def test_initial_users(self, mock_db):
-        """Test initial users are loaded."""
-        assert len(mock_db.users) == 2
-        assert "user1@example.com" in mock_db.users
-        assert "user2@example.com" in mock_db.users
+@pytest.fixture
+def user1(database):
+    """The seeded PixelMaster user."""
+    return database.get_user_by_email("user1@example.com")
+
 
-    def test_get_user_by_email(self, mock_db):
+class TestDatabase:
+    def test_initial_users(self, database):
+        """Test initial users are seeded."""
+        assert database.get_user_by_email("user1@example.com") is not None
+        assert database.get_user_by_email("user2@example.com") is not None
+        assert database.get_user_by_email("user3@example.com") is not None
+
+    def test_get_user_by_email(self, database):
         """Test retrieving user by email."""
-        user = mock_db.get_user_by_email("user1@example.com")
+        user = database.get_user_by_email("user1@example.com")
         assert user is not None
         assert user["username"] == "PixelMaster"
         assert user["email"] == "user1@example.com"
 
-    def test_get_user_by_email_not_found(self, mock_db):
+    def test_get_user_by_email_not_found(self, database):
         """Test retrieving non-existent user by email."""
-        user = mock_db.get_user_by_email("nonexistent@example.com")
+        user = database.get_user_by_email("nonexistent@example.com")
         assert user is None
 
-    def test_get_user_by_id(self, mock_db):
+    def test_get_user_by_id(self, database, user1):
         """Test retrieving user by ID."""
-        user = mock_db.get_user_by_id("1")
+        user = database.get_user_by_id(user1["id"])
         assert user is not None
         assert user["username"] == "PixelMaster"
 
-    def test_get_user_by_id_not_found(self, mock_db):
+    def test_get_user_by_id_not_found(self, database):
         """Test retrieving non-existent user by ID."""
-        user = mock_db.get_user_by_id("999")
+        user = database.get_user_by_id("999")
         assert user is None
 
-    def test_create_user(self, mock_db):
+    def test_create_user(self, database):
         """Test creating a new user."""
-        user = mock_db.create_user(
-            username="NewPlayer",
+        user = database.create_user(
+            username="FreshPlayer",
             email="new@example.com",
             password="password123",
         )
-        assert user["username"] == "NewPlayer"
+        assert user["username"] == "FreshPlayer"
         assert user["email"] == "new@example.com"
-        assert "password_hash" in user
+        assert "password_hash" not in user
+        assert database.get_user_by_email("new@example.com")["id"] == user["id"]
 
-    def test_create_user_duplicate_email(self, mock_db):
+    def test_create_user_duplicate_email(self, database):
         """Test creating user with existing email raises error."""
         with pytest.raises(ValueError):
-            mock_db.create_user(
+            database.create_user(
                 username="AnotherUser",
                 email="user1@example.com",
                 password="password123",
             )
 
-    def test_verify_password(self, mock_db):
+    def test_verify_password(self, database):
         """Test password verification."""
-        user = mock_db.get_user_by_email("user1@example.com")
-        assert mock_db.verify_password("password123", user["password_hash"]) is True
-        assert mock_db.verify_password("wrongpassword", user["password_hash"]) is False
+        user = database.verify_user_password("user1@example.com", "password123")
+        assert user is not None
+        assert user["username"] == "PixelMaster"
+        assert database.verify_user_password("user1@example.com", "wrongpassword") is None
 
-    def test_get_leaderboard(self, mock_db):
+    def test_get_leaderboard(self, database):
         """Test retrieving leaderboard."""
-        entries = mock_db.get_leaderboard()
+        entries = database.get_leaderboard()
         assert len(entries) == 5
         # Check sorted by score descending
         scores = [e["score"] for e in entries]
         assert scores == sorted(scores, reverse=True)
 
-    def test_get_leaderboard_by_mode(self, mock_db):
+    def test_get_leaderboard_by_mode(self, database):
         """Test retrieving leaderboard filtered by mode."""
-        entries = mock_db.get_leaderboard(mode="walls")
+        entries = database.get_leaderboard(mode=GameModeEnum.walls)
         assert all(e["mode"] == "walls" for e in entries)
 
-        entries = mock_db.get_leaderboard(mode="pass-through")
+        entries = database.get_leaderboard(mode=GameModeEnum.pass_through)
         assert all(e["mode"] == "pass-through" for e in entries)
 
-    def test_submit_score(self, mock_db):
+    def test_get_leaderboard_fresh_skips_cache(self, database, db_session, user1):
+        """Test that a fresh read sees rows the cached result misses."""
+        cached = database.get_leaderboard()
+        db_session.add(LeaderboardEntry(
+            user_id=user1["id"], username="PixelMaster", score=7777, mode=GameModeEnum.walls
+        ))
+        db_session.commit()
+
+        assert database.get_leaderboard() == cached
+        assert database.get_leaderboard(fresh=True)[0]["score"] == 7777
+
+    def test_submit_score(self, database, user1):
         """Test submitting a score."""
-        initial_count = len(mock_db.leaderboard)
-        entry = mock_db.submit_score(user_id="1", score=5000, mode="walls")
+        initial_count = len(database.get_leaderboard())
+        entry = database.submit_score(user_id=user1["id"], score=5000, mode=GameModeEnum.walls)
         assert entry["score"] == 5000
         assert entry["mode"] == "walls"
         assert entry["username"] == "PixelMaster"
-        assert len(mock_db.leaderboard) == initial_count + 1
+        assert entry["rank"] == 1
+        assert len(database.get_leaderboard()) == initial_count + 1
 
-    def test_submit_score_user_not_found(self, mock_db):
+    def test_submit_score_leaves_published_cache_untouched(self, database, user1):
+        """Test that a submission replaces cached lists instead of mutating them."""
+        database.get_leaderboard()
+        published = _LB_CACHE[(None, 100)][1]
+        snapshot = [dict(entry) for entry in published]
+
+        database.submit_score(user_id=user1["id"], score=5000, mode=GameModeEnum.walls)
+
+        assert published == snapshot
+        assert [e["rank"] for e in database.get_leaderboard()] == list(range(1, len(snapshot) + 2))
+
+    def test_submit_score_tie_shares_rank(self, database, user1):
+        """Test that a tied score shares the best position."""
+        entry = database.submit_score(user_id=user1["id"], score=2100, mode=GameModeEnum.walls)
+        assert entry["rank"] == 2
+
+    def test_submit_score_user_not_found(self, database):
         """Test submitting score for non-existent user."""
         with pytest.raises(ValueError):
-            mock_db.submit_score(user_id="999", score=100, mode="walls")
+            database.submit_score(user_id="999", score=100, mode=GameModeEnum.walls)
 
-    def test_leaderboard_reranking(self, mock_db):
+    def test_leaderboard_reranking(self, database, user1):
         """Test that leaderboard is re-ranked after new submission."""
-        mock_db.submit_score(user_id="1", score=99999, mode="walls")
-        entries = mock_db.get_leaderboard(mode="walls")
+        database.submit_score(user_id=user1["id"], score=99999, mode=GameModeEnum.walls)
+        entries = database.get_leaderboard(mode=GameModeEnum.walls)
         # Highest score should be rank 1
         assert entries[0]["score"] == 99999
         assert entries[0]["rank"] == 1
 
-    def test_get_live_players(self, mock_db):
+    def test_get_live_players(self, database):
         """Test retrieving live players."""
-        players = mock_db.get_live_players()
+        players = database.get_live_sessions()
         assert len(players) >= 2
 
-    def test_get_player_stream(self, mock_db):
+    def test_get_player_stream(self, database):
         """Test retrieving specific player stream."""
-        player = mock_db.get_player_stream("live1")
+        player = database.get_live_session("live1")
         assert player is not None
         assert player["id"] == "live1"
         assert player["username"] == "StreamerPro"
 
-    def test_get_player_stream_not_found(self, mock_db):
+    def test_get_player_stream_not_found(self, database):
         """Test retrieving non-existent player."""
-        player = mock_db.get_player_stream("nonexistent")
+        player = database.get_live_session("nonexistent")
         assert player is None
 
-    def test_update_live_player(self, mock_db):
+    def test_update_live_player(self, database):
         """Test updating a live player."""
-        updated = mock_db.update_live_player("live1", {"score": 999, "viewers": 100})
-        assert updated is not None
+        state = {"snake": [{"x": 1, "y": 1}], "food": {"x": 2, "y": 2}, "direction": "UP"}
+        updated = database.update_live_session("live1", score=999, game_state=state)
         assert updated["score"] == 999
-        assert updated["viewers"] == 100
+        assert updated["direction"] == "UP"
+        assert database.get_live_session("live1")["score"] == 999
 
-    def test_update_live_player_not_found(self, mock_db):
+    def test_update_live_player_not_found(self, database):
         """Test updating non-existent player."""
-        updated = mock_db.update_live_player("nonexistent", {"score": 100})
-        assert updated is None
-
-    def test_reset_database(self, mock_db):
-        """Test database reset."""
-        # Modify data
-        mock_db.create_user("TestUser", "test@example.com", "password")
-        mock_db.submit_score("1", 9999, "walls")
-
-        # Reset
-        mock_db.reset()
-
-        # Verify reset
-        assert len(mock_db.users) == 2
-        assert "test@example.com" not in mock_db.users
-        assert len(mock_db.leaderboard) == 5
+        with pytest.raises(ValueError):
+            database.update_live_session("nonexistent", score=100, game_state={})
+
+    def test_changes_rolled_back(self, database):
+        """Test that changes from earlier tests were rolled back."""
+        assert database.get_user_by_email("new@example.com") is None
+        assert len(database.get_leaderboard()) == 5
+        assert database.get_live_session("live1")["score"] == 340
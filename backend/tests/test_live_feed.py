@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+from app import live_feed
+from app.routers.live import stream_live_players
+
+
+class FakePlayers:
+    """Live players served to the publisher in place of the database."""
+
+    def __init__(self):
+        self.players = [{"id": "live1", "score": 340}]
+        self.fetches = 0
+
+    async def fetch(self):
+        self.fetches += 1
+        return list(self.players)
+
+
+@pytest.fixture
+def players(monkeypatch):
+    """Run the feed against in-memory players with short intervals."""
+    fake = FakePlayers()
+    monkeypatch.setattr(live_feed, "_fetch_players", fake.fetch)
+    monkeypatch.setattr(live_feed, "LIVE_FEED_INTERVAL", 0.01)
+    monkeypatch.setattr(live_feed, "LIVE_FEED_KEEPALIVE", 0.2)
+    monkeypatch.setattr(live_feed, "_subscribers", set())
+    monkeypatch.setattr(live_feed, "_snapshot", None)
+    monkeypatch.setattr(live_feed, "_publisher", None)
+    return fake
+
+
+async def open_stream():
+    response = await stream_live_players()
+    return response.body_iterator
+
+
+async def close_streams(*streams):
+    """Disconnect the streams and let the publisher wind down on this loop."""
+    for stream in streams:
+        await stream.aclose()
+    if live_feed._publisher is not None:
+        await asyncio.wait_for(live_feed._publisher, 1)
+
+
+def event(players):
+    return b"data: " + live_feed.encode_players(players) + b"\n\n"
+
+
+class TestLiveFeed:
+    @pytest.mark.asyncio
+    async def test_first_event_is_snapshot(self, players):
+        stream = await open_stream()
+        try:
+            assert await asyncio.wait_for(stream.__anext__(), 1) == event(players.players)
+        finally:
+            await close_streams(stream)
+
+    @pytest.mark.asyncio
+    async def test_change_fans_out_to_all_subscribers(self, players):
+        first, second = await open_stream(), await open_stream()
+        try:
+            snapshot = event(players.players)
+            assert await asyncio.wait_for(first.__anext__(), 1) == snapshot
+            assert await asyncio.wait_for(second.__anext__(), 1) == snapshot
+
+            players.players = [{"id": "live1", "score": 400}]
+            changed = event(players.players)
+            assert await asyncio.wait_for(first.__anext__(), 1) == changed
+            assert await asyncio.wait_for(second.__anext__(), 1) == changed
+        finally:
+            await close_streams(first, second)
+
+    @pytest.mark.asyncio
+    async def test_keepalive_while_unchanged(self, players):
+        stream = await open_stream()
+        try:
+            await asyncio.wait_for(stream.__anext__(), 1)
+            assert await asyncio.wait_for(stream.__anext__(), 1) == b": keepalive\n\n"
+        finally:
+            await close_streams(stream)
+
+    @pytest.mark.asyncio
+    async def test_publisher_stops_after_last_subscriber(self, players):
+        first, second = await open_stream(), await open_stream()
+        await asyncio.wait_for(first.__anext__(), 1)
+        await asyncio.wait_for(second.__anext__(), 1)
+        publisher = live_feed._publisher
+
+        await first.aclose()
+        await asyncio.sleep(0.05)
+        assert not publisher.done()
+
+        await second.aclose()
+        await asyncio.wait_for(publisher, 1)
+        assert live_feed._publisher is None
+        assert live_feed.latest_snapshot() is None
+
+        fetches = players.fetches
+        await asyncio.sleep(0.05)
+        assert players.fetches == fetches
@@ -0,0 +1,112 @@
+import asyncio
+import msgpack
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from app import database
+from app.database import AsyncDatabase, flush_live_session_updates
+from app.models import GameModeEnum, LiveSession, User
+
+TICK = {"snake": [{"x": 3, "y": 4}, {"x": 2, "y": 4}], "food": {"x": 7, "y": 7}, "direction": "LEFT"}
+
+
+@pytest.fixture(autouse=True)
+def empty_buffer(monkeypatch):
+    """Start each test with no buffered live updates."""
+    monkeypatch.setattr(database, "_pending_live_updates", {})
+
+
+def pending():
+    # Flushes swap the buffer out, so always read the current one
+    return database._pending_live_updates
+
+
+@pytest.fixture
+def live_session(seeded_database):
+    """A committed live session owned by the seeded PixelMaster user."""
+    with Session(seeded_database) as db:
+        user = db.scalars(select(User).where(User.email == "user1@example.com")).one()
+        db.add(LiveSession(
+            id="tick-session",
+            user_id=user.id,
+            username=user.username,
+            score=10,
+            mode=GameModeEnum.walls,
+            status="playing",
+            viewers=0,
+            game_state=msgpack.packb({"snake": [], "food": {"x": 0, "y": 0}, "direction": "UP"}),
+        ))
+        db.commit()
+
+    yield {"id": "tick-session"}
+
+    with Session(seeded_database) as db:
+        db.execute(delete(LiveSession).where(LiveSession.id == "tick-session"))
+        db.commit()
+
+
+class HangingSession:
+    """Session whose writes never finish, to cancel a flush mid-write."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, *args):
+        await asyncio.Event().wait()
+
+
+class TestLiveSessionUpdates:
+    @pytest.mark.asyncio
+    async def test_update_buffers_latest_state(self, async_session_factory, live_session):
+        async with async_session_factory() as db:
+            live = AsyncDatabase(db)
+            await live.update_live_session(live_session["id"], 20, {**TICK, "direction": "UP"})
+            updated = await live.update_live_session(live_session["id"], 30, TICK)
+
+            assert updated["score"] == 30
+            assert updated["direction"] == "LEFT"
+            assert updated["username"] == "PixelMaster"
+            assert pending()[live_session["id"]][:2] == (30, TICK)
+            # Nothing is written until the flush
+            assert (await live.get_live_session(live_session["id"]))["score"] == 10
+
+    @pytest.mark.asyncio
+    async def test_update_unknown_session(self, async_session_factory):
+        async with async_session_factory() as db:
+            with pytest.raises(ValueError):
+                await AsyncDatabase(db).update_live_session("nonexistent", 1, TICK)
+        assert pending() == {}
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_pending_updates(self, async_session_factory, live_session):
+        async with async_session_factory() as db:
+            await AsyncDatabase(db).update_live_session(live_session["id"], 30, TICK)
+
+        assert await flush_live_session_updates(async_session_factory) == 1
+        assert pending() == {}
+
+        async with async_session_factory() as db:
+            stored = await AsyncDatabase(db).get_live_session(live_session["id"])
+        assert stored["score"] == 30
+        assert stored["snake"] == TICK["snake"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_flush_requeues_batch(self):
+        pending()["a"] = (1, TICK, None)
+        pending()["b"] = (2, TICK, None)
+
+        flush = asyncio.create_task(flush_live_session_updates(HangingSession))
+        await asyncio.sleep(0)
+        assert pending() == {}
+        # A newer tick for "b" arrives while the flush is in flight
+        pending()["b"] = (3, TICK, None)
+
+        flush.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flush
+
+        assert pending() == {"a": (1, TICK, None), "b": (3, TICK, None)}
+
@@ -0,0 +1,183 @@
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from app import cache, database
+from app.database import flush_queued_scores, queue_score, record_score_rank
+from app.main import app
+from app.models import GameModeEnum, LeaderboardEntry, User
+from app.security import create_access_token
+
+
+class FakeQueue:
+    """Stands in for the Redis side of the score queue."""
+
+    def __init__(self, rank=1):
+        self.rank = rank
+        self.queued = []
+        self.acked = []
+        self.requeued = []
+        self.dead = []
+        self.invalidated = []
+        self.ranked = []
+        self.rank_writes_fail = False
+
+    async def enqueue_score(self, mode, entry_id, score, payload):
+        if self.rank is None:
+            return None
+        self.queued.append(payload)
+        return self.rank
+
+    async def pop_scores(self, max_batch, timeout):
+        items, self.queued = self.queued[:max_batch], self.queued[max_batch:]
+        return items
+
+    async def ack_scores(self, items):
+        self.acked.extend(items)
+
+    async def requeue_scores(self, items):
+        self.requeued.extend(items)
+
+    async def dead_letter_scores(self, items):
+        self.dead.extend(items)
+
+    async def invalidate_leaderboard(self, mode):
+        self.invalidated.append(mode)
+
+    async def add_score_rank(self, mode, entry_id, score):
+        self.ranked.append((mode, entry_id, score))
+        return not self.rank_writes_fail
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    """Route the score queue's Redis calls to a FakeQueue."""
+    fake = FakeQueue()
+    for name in ("enqueue_score", "pop_scores", "ack_scores", "requeue_scores",
+                 "dead_letter_scores", "invalidate_leaderboard", "add_score_rank"):
+        monkeypatch.setattr(cache, name, getattr(fake, name))
+    monkeypatch.setattr(database, "_score_ranks_stale", False)
+    return fake
+
+
+@pytest.fixture
+def user1(seeded_database):
+    """The seeded PixelMaster user, as get_current_user returns it."""
+    with Session(seeded_database) as db:
+        user = db.scalars(select(User).where(User.email == "user1@example.com")).one()
+        return {"id": user.id, "username": user.username, "avatar": user.avatar}
+
+
+@pytest.fixture
+def drained_ids(seeded_database):
+    """Ids of entries a test drains into the database; deleted afterwards."""
+    ids = []
+    yield ids
+    with Session(seeded_database) as db:
+        db.execute(delete(LeaderboardEntry).where(LeaderboardEntry.id.in_(ids)))
+        db.commit()
+
+
+class FailingSession:
+    """Session whose writes fail, as when the database is down."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, *args):
+        raise RuntimeError("database unavailable")
+
+
+class TestScoreQueue:
+    @pytest.mark.asyncio
+    async def test_queue_score_enqueues_entry(self, queue, user1):
+        entry = await queue_score(user1, 3000, GameModeEnum.walls)
+
+        assert entry["rank"] == 1
+        assert entry["score"] == 3000
+        assert entry["mode"] == "walls"
+        queued = orjson.loads(queue.queued[0])
+        assert queued["id"] == entry["id"]
+        assert queued["user_id"] == user1["id"]
+
+    @pytest.mark.asyncio
+    async def test_queue_score_unavailable(self, queue, user1):
+        queue.rank = None
+        assert await queue_score(user1, 3000, GameModeEnum.walls) is None
+
+    @pytest.mark.asyncio
+    async def test_drain_writes_and_acks_batch(self, queue, user1, async_session_factory, drained_ids):
+        entries = [await queue_score(user1, score, GameModeEnum.walls) for score in (3000, 3100)]
+        drained_ids.extend(e["id"] for e in entries)
+        items = list(queue.queued)
+
+        assert await flush_queued_scores(async_session_factory, timeout=0) == 2
+
+        async with async_session_factory() as db:
+            stored = await db.execute(
+                select(LeaderboardEntry.score).where(LeaderboardEntry.id.in_(drained_ids))
+            )
+            assert sorted(stored.scalars().all()) == [3000, 3100]
+        assert queue.acked == items
+        assert queue.invalidated == [GameModeEnum.walls]
+
+    @pytest.mark.asyncio
+    async def test_drain_skips_entries_already_stored(self, queue, user1, async_session_factory, drained_ids):
+        entry = await queue_score(user1, 3000, GameModeEnum.walls)
+        drained_ids.append(entry["id"])
+        item = queue.queued[0]
+        await flush_queued_scores(async_session_factory, timeout=0)
+
+        # Requeued after a crash between the commit and the ack
+        queue.queued.append(item)
+        assert await flush_queued_scores(async_session_factory, timeout=0) == 0
+        assert queue.acked == [item, item]
+
+    @pytest.mark.asyncio
+    async def test_drain_requeues_batch_on_failure(self, queue, user1):
+        await queue_score(user1, 3000, GameModeEnum.walls)
+        items = list(queue.queued)
+
+        with pytest.raises(RuntimeError):
+            await flush_queued_scores(FailingSession, timeout=0)
+
+        assert queue.requeued == items
+        assert queue.acked == []
+
+    @pytest.mark.asyncio
+    async def test_drain_dead_letters_malformed_entries(self, queue, user1, async_session_factory, drained_ids):
+        entry = await queue_score(user1, 3000, GameModeEnum.walls)
+        drained_ids.append(entry["id"])
+        good = queue.queued[0]
+        bad = orjson.dumps({**orjson.loads(good), "id": "bad-mode", "mode": "classic"})
+        queue.queued += [bad, b"not json"]
+
+        assert await flush_queued_scores(async_session_factory, timeout=0) == 1
+
+        assert queue.dead == [bad, b"not json"]
+        assert queue.acked == [good]
+        assert queue.requeued == []
+
+    @pytest.mark.asyncio
+    async def test_failed_rank_write_marks_ranks_stale(self, queue):
+        queue.rank_writes_fail = True
+        await record_score_rank({"id": "e1", "score": 10}, GameModeEnum.walls)
+        assert database._score_ranks_stale is True
+
+    def test_direct_submission_updates_rank_set(self, queue, user1):
+        queue.rank = None
+        token = create_access_token(data={"sub": user1["id"]})
+
+        response = TestClient(app).post(
+            "/leaderboard/submit?score=4200&mode=walls",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 200
+        entry = response.json()["data"]
+        assert queue.ranked == [(GameModeEnum.walls, entry["id"], 4200)]
+        assert database._score_ranks_stale is False
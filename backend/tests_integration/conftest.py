@@ -1,160 +1,283 @@
 """
 Integration test configuration and fixtures.
-Uses a separate SQLite database for testing.
+Uses a separate in-memory SQLite database for testing.
 """
 import os
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool, StaticPool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from fastapi.testclient import TestClient
 
 from app.main import app
 from app.models import Base
-from app.db import get_db
-from app.security import hash_password
+from app.db import get_db, aget_db
+from app.database import clear_leaderboard_cache
+from app.security import clear_token_cache
+from argon2 import PasswordHasher
+from app import security
 
-# Use a separate test database
-TEST_DATABASE_URL = "sqlite:///./test_snake_arena.db"
+# Minimum-cost argon2 for tests; the work factor only matters in production
+_FAST_ARGON2 = PasswordHasher(time_cost=1, memory_cost=8, parallelism=1)
+
+# Seeded users' password hashes, computed once per run
+_PW_HASHES = {
+    password: _FAST_ARGON2.hash(password)
+    for password in ("password123", "password456", "password789")
+}
+
+# Use a separate in-memory test database. It is a named shared-cache database
+# because the sync and async engines both have to see it; it lives as long as
+# the sync engine's single StaticPool connection stays open. Each pytest-xdist
+# worker gets its own.
+_WORKER = os.getenv("PYTEST_XDIST_WORKER", "main")
+TEST_DATABASE_URL = f"sqlite:///file:test_snake_arena_{_WORKER}?mode=memory&cache=shared&uri=true"
+TEST_ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///file:test_snake_arena_{_WORKER}?mode=memory&cache=shared&uri=true"
 
 # Create test engine
 test_engine = create_engine(
     TEST_DATABASE_URL,
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
 )
 
-# Create test session factory
-TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+
+def _set_test_pragmas(dbapi_connection):
+    # Keep sort and temp b-trees in RAM too. Journal and sync settings do not
+    # apply to an in-memory database, and exclusive locking would shut the
+    # async engine out of it.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+# pysqlite manages transactions itself and breaks SAVEPOINTs; take over BEGIN
+@event.listens_for(test_engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+    _set_test_pragmas(dbapi_connection)
+
+
+@event.listens_for(test_engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+# Async engine on the same database for the async routes. NullPool so no
+# connection outlives the event loop it was opened on.
+test_async_engine = create_async_engine(TEST_ASYNC_DATABASE_URL, poolclass=NullPool)
+
+
+# Each test's rows stay uncommitted in its rolled-back transaction; let the
+# async connections read them instead of hitting shared-cache table locks.
+@event.listens_for(test_async_engine.sync_engine, "connect")
+def _read_uncommitted(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA read_uncommitted=1")
+    cursor.close()
+    _set_test_pragmas(dbapi_connection)
+
+
+# Create test session factories
+TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=test_engine)
+TestAsyncSessionLocal = async_sessionmaker(
+    test_async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 
 
-def get_test_db() -> Session:
-    """Override database dependency for testing."""
-    db = TestSessionLocal()
-    try:
+async def aget_test_db() -> AsyncSession:
+    """Override async database dependency for testing."""
+    async with TestAsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    """Create a fresh database session for each test."""
-    # Create all tables
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing():
+    """Hash and verify passwords with the minimum-cost argon2 parameters."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(security, "_ARGON2", _FAST_ARGON2)
+        yield
+
+
+@pytest.fixture(scope="session")
+def test_schema():
+    """Create the test schema once per run."""
     Base.metadata.create_all(bind=test_engine)
+    app.dependency_overrides[aget_db] = aget_test_db
+    yield
+    app.dependency_overrides.pop(aget_db, None)
+    Base.metadata.drop_all(bind=test_engine)
+    test_engine.dispose()
+
+
+@pytest.fixture(scope="class")
+def db_connection(test_schema):
+    """
+    The sync engine's connection for a test class, emptied afterwards.
     
-    # Create a session
-    session = TestSessionLocal()
+    No transaction is held across tests: in a shared-cache database an open
+    write transaction locks its tables, and the async routes (signup, login)
+    could not write to them. Class data is committed instead, and each test
+    runs in its own rolled-back transaction.
+    """
+    connection = test_engine.connect()
+    
+    yield connection
+    
+    # Class seed data and async-route writes were committed; delete them
+    with connection.begin():
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    connection.close()
+
+
+@pytest.fixture(scope="function")
+def db_session(db_connection):
+    """Run each test inside a transaction that is rolled back afterwards."""
+    transaction = db_connection.begin()
+    # Route commits to a SAVEPOINT so the test's transaction can undo them
+    session = TestSessionLocal(bind=db_connection, join_transaction_mode="create_savepoint")
     
     yield session
     
     # Cleanup
     session.close()
-    Base.metadata.drop_all(bind=test_engine)
+    transaction.rollback()
+    clear_leaderboard_cache()
+    clear_token_cache()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def _no_autoflush(db_session):
+    """Fail tests whose session (shared with the requests) autoflushes."""
+    assert db_session.autoflush is False
+    yield
+    assert db_session.autoflush is False, "test session autoflush was re-enabled"
+
+
+@pytest.fixture(scope="session")
+def _client(test_schema):
+    """Test client shared by the whole run."""
+    # Not entered as a context manager, so app startup never runs: the tests
+    # need none of it, and it would init and seed the real database.
+    return TestClient(app)
 
 
 @pytest.fixture(scope="function")
-def client(db_session):
-    """Create a test client with database override."""
-    # Override the database dependency
-    app.dependency_overrides[get_db] = get_test_db
+def client(_client, db_session):
+    """Test client with the database dependency bound to the test's session."""
+    # Requests share the test's session so its transaction sees their writes
+    app.dependency_overrides[get_db] = lambda: db_session
     
-    with TestClient(app) as test_client:
-        yield test_client
+    yield _client
     
     # Clear overrides
-    app.dependency_overrides.clear()
+    app.dependency_overrides.pop(get_db, None)
 
 
 @pytest.fixture(scope="function")
-def seed_test_data(db_session):
-    """Seed the test database with sample data."""
-    from app.models import User, LeaderboardEntry, GameMode
+def query_counter():
+    """Count SQL statements emitted against the test engine."""
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engines = (test_engine, test_async_engine.sync_engine)
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _count)
+    yield statements
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", _count)
+
+
+@pytest.fixture(scope="class")
+def seed_test_data(db_connection):
+    """Seed the test database with sample data, once per test class."""
+    from app.models import User, LeaderboardEntry, GameModeEnum
     from datetime import datetime, timedelta
     
+    # Committed, so async connections see it without holding table locks;
+    # db_connection deletes it after the class
+    db_session = TestSessionLocal(bind=db_connection)
+    
     # Create test users
     users = [
         User(
             username="TestUser1",
             email="test1@example.com",
-            password_hash=hash_password("password123")
+            password_hash=_PW_HASHES["password123"]
         ),
         User(
             username="TestUser2",
             email="test2@example.com",
-            password_hash=hash_password("password456")
+            password_hash=_PW_HASHES["password456"]
         ),
         User(
             username="TestUser3",
             email="test3@example.com",
-            password_hash=hash_password("password789")
+            password_hash=_PW_HASHES["password789"]
         )
     ]
     
-    for user in users:
-        db_session.add(user)
-    
-    db_session.commit()
-    
-    # Refresh to get IDs
-    for user in users:
-        db_session.refresh(user)
+    # Flushing assigns the IDs; users and entries share one commit
+    db_session.add_all(users)
+    db_session.flush()
     
     # Create leaderboard entries
     entries = [
         LeaderboardEntry(
-            user_id=users[0].id,
-            game_mode=GameMode.CLASSIC,
-            score=1500,
-            achieved_at=datetime.utcnow() - timedelta(days=1)
-        ),
-        LeaderboardEntry(
-            user_id=users[1].id,
-            game_mode=GameMode.CLASSIC,
-            score=1200,
-            achieved_at=datetime.utcnow() - timedelta(days=2)
-        ),
-        LeaderboardEntry(
-            user_id=users[2].id,
-            game_mode=GameMode.CLASSIC,
-            score=900,
-            achieved_at=datetime.utcnow() - timedelta(days=3)
-        ),
-        LeaderboardEntry(
-            user_id=users[0].id,
-            game_mode=GameMode.TIMED,
-            score=2000,
-            achieved_at=datetime.utcnow() - timedelta(hours=5)
+            user_id=user.id,
+            username=user.username,
+            mode=mode,
+            score=score,
+            created_at=datetime.utcnow() - age
         )
+        for user, mode, score, age in [
+            (users[0], GameModeEnum.walls, 1500, timedelta(days=1)),
+            (users[1], GameModeEnum.walls, 1200, timedelta(days=2)),
+            (users[2], GameModeEnum.walls, 900, timedelta(days=3)),
+            (users[0], GameModeEnum.pass_through, 2000, timedelta(hours=5)),
+        ]
     ]
     
-    for entry in entries:
-        db_session.add(entry)
-    
+    db_session.add_all(entries)
     db_session.commit()
     
-    return {
+    yield {
         "users": users,
         "entries": entries
     }
+    
+    db_session.close()
 
 
-@pytest.fixture(scope="function")
-def auth_headers(client, seed_test_data):
-    """Get authentication headers for API requests."""
-    response = client.post(
-        "/auth/login",
-        json={
-            "email": "test1@example.com",
-            "password": "password123"
-        }
-    )
-    
-    assert response.status_code == 200
-    token = response.json()["data"]["access_token"]
+@pytest.fixture(scope="class")
+def auth_headers(seed_test_data):
+    """Get authentication headers for TestUser1, once per test class."""
+    # Mint the token the login route would issue; the login flow itself is
+    # covered by test_login_with_seeded_user
+    token = security.create_access_token(data={"sub": seed_test_data["users"][0].id})
     
     return {"Authorization": f"Bearer {token}"}
 
 
-def cleanup_test_db():
-    """Remove the test database file."""
-    if os.path.exists("test_snake_arena.db"):
-        os.remove("test_snake_arena.db")
+@pytest.fixture(scope="class")
+def login_for(_client, seed_test_data):
+    """
+    Log in seeded users through /auth/login, once per user per test class.
+    
+    Usage:
+        headers = login_for("test2@example.com", "password456")
+    """
+    cache = {}
+    
+    def _login(email: str, password: str) -> dict:
+        if email not in cache:
+            response = _client.post("/auth/login", json={"email": email, "password": password})
+            assert response.status_code == 200
+            token = response.json()["data"]["access_token"]
+            cache[email] = {"Authorization": f"Bearer {token}"}
+        return cache[email]
+    
+    return _login
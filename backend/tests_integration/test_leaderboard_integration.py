@@ -75,6 +75,13 @@ class TestLeaderboardIntegration:
         assert leaderboard[0]["username"] == "TestUser1"
         assert leaderboard[0]["score"] == 2500
     
+    def test_get_leaderboard_query_count(self, client, query_counter):
+        """Test that listing the leaderboard stays within a fixed query budget."""
+        response = client.get("/leaderboard")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(query_counter) <= 2
+    
     def test_submit_score_unauthenticated(self, client):
         """Test submitting a score without authentication."""
         score_data = {
@@ -153,15 +160,16 @@ class TestLeaderboardIntegration:
         scores = [800, 1600, 1100, 2200]
         
         for score in scores:
-            client.post(
+            response = client.post(
                 "/leaderboard/submit",
-                json={"mode": "classic", "score": score},
-                headers=auth_headers
+                params={"mode": "walls", "score": score},
+                headers=auth_headers,
             )
+            assert response.status_code == 200
         
         # Get leaderboard
-        response = client.get("/leaderboard/classic")
-        leaderboard = response.json()["data"]
+        response = client.get("/leaderboard", params={"mode": "walls"})
+        leaderboard = response.json()["data"]["entries"]
         
         # Verify ordering
         scores_in_leaderboard = [entry["score"] for entry in leaderboard]
@@ -170,31 +178,41 @@ class TestLeaderboardIntegration:
         # Highest score should be first
         assert leaderboard[0]["score"] == 2200
     
-    def test_leaderboard_limit(self, client, seed_test_data):
+    def test_leaderboard_limit(self, client, db_session, seed_test_data):
         """Test leaderboard entry limit (top 10)."""
-        # Create a new user and add 15 scores
-        signup_response = client.post(
-            "/auth/signup",
-            json={
-                "username": "LeaderboardTester",
-                "email": "tester@example.com",
-                "password": "password123"
-            }
+        from app.models import User, LeaderboardEntry, GameModeEnum
+        from datetime import datetime
+        
+        # Create a new user with 15 scores directly; submission has its own tests
+        user = User(
+            username="LeaderboardTester",
+            email="tester@example.com",
+            password_hash="unused"
         )
-        token = signup_response.json()["data"]["access_token"]
-        headers = {"Authorization": f"Bearer {token}"}
-        
-        # Submit 15 different scores
-        for i in range(15):
-            client.post(
-                "/leaderboard/submit",
-                json={"mode": "classic", "score": (i + 1) * 100},
-                headers=headers
+        db_session.add(user)
+        db_session.flush()
+        db_session.add_all([
+            LeaderboardEntry(
+                user_id=user.id,
+                username=user.username,
+                mode=GameModeEnum.walls,
+                score=(i + 1) * 100,
+                created_at=datetime.utcnow()
             )
+            for i in range(15)
+        ])
+        db_session.commit()
         
         # Get leaderboard
-        response = client.get("/leaderboard/classic")
-        leaderboard = response.json()["data"]
+        response = client.get("/leaderboard?mode=walls&limit=10")
+        assert response.status_code == status.HTTP_200_OK
+        page = response.json()["data"]
+        leaderboard = page["entries"]
         
-        # Should return top 10 entries
-        assert len(leaderboard) <= 10
+        # Should return the top 10 of the 18 walls entries
+        assert len(leaderboard) == 10
+        scores = [entry["score"] for entry in leaderboard]
+        assert scores == sorted(scores, reverse=True)
+        assert scores[0] == 1500
+        assert [entry["rank"] for entry in leaderboard] == list(range(1, 11))
+        assert page["next_cursor"] is not None
@@ -20,6 +20,30 @@ class TestLiveIntegration:
         assert isinstance(result["data"], list)
         assert len(result["data"]) == 0
     
+    def test_get_live_players_query_count(self, client, query_counter):
+        """Test that listing live players stays within a fixed query budget."""
+        response = client.get("/live/players")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(query_counter) <= 2
+
+    def test_get_player_stream_query_count(self, client, db_session, query_counter):
+        """Test that a single player's stream is read with one query."""
+        from app.database import Database
+        from app.models import GameModeEnum, User
+
+        user = User(username="streamer", email="streamer@example.com", password_hash="x")
+        db_session.add(user)
+        db_session.commit()
+        live = Database(db_session).create_live_session(user.id, GameModeEnum.walls)
+        query_counter.clear()
+
+        response = client.get(f"/live/players/{live['id']}")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"]["username"] == "streamer"
+        assert len(query_counter) == 1
+
     def test_update_live_player_authenticated(self, client, auth_headers, seed_test_data):
         """Test updating live player state with authentication."""
         game_state = {
@@ -82,23 +106,10 @@ class TestLiveIntegration:
         assert player["snake_length"] == 15
         assert player["is_alive"] is True
     
-    def test_multiple_live_players(self, client, seed_test_data):
+    def test_multiple_live_players(self, client, login_for):
         """Test multiple players can be live simultaneously."""
-        # Login as first user
-        login1 = client.post(
-            "/auth/login",
-            json={"email": "test1@example.com", "password": "password123"}
-        )
-        token1 = login1.json()["data"]["access_token"]
-        headers1 = {"Authorization": f"Bearer {token1}"}
-        
-        # Login as second user
-        login2 = client.post(
-            "/auth/login",
-            json={"email": "test2@example.com", "password": "password456"}
-        )
-        token2 = login2.json()["data"]["access_token"]
-        headers2 = {"Authorization": f"Bearer {token2}"}
+        headers1 = login_for("test1@example.com", "password123")
+        headers2 = login_for("test2@example.com", "password456")
         
         # Update both players
         client.post(
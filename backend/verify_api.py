@@ -6,22 +6,60 @@ This script validates that the running server responds correctly to all endpoint
 checks response formats, and ensures data integrity.
 
 Usage:
-    python verify_api.py [--url http://localhost:8000] [--verbose]
+    python verify_api.py [--url http://localhost:8000] [--verbose] [--parallel N] [--timeout SECONDS]
 
 Options:
     --url         Base URL of the API server (default: http://localhost:8000)
     --verbose     Enable verbose output for debugging
     --no-color    Disable colored output
+    --parallel    Run up to N test suites at once (default: 1)
+    --timeout     Time limit for the whole run in seconds (default: 60)
 """
 
-import requests
-import json
+import asyncio
+import contextvars
+import httpx
+import orjson
+import secrets
+import socket
 import sys
+import time
 import argparse
 from typing import Dict, Tuple, Any, Optional, List
-from urllib.parse import urljoin
 from dataclasses import dataclass, field
-from datetime import datetime
+
+# HTTP/2 (negotiated over TLS, e.g. with a deployed https:// server) needs the
+# optional h2 package: pip install "httpx[http2]"
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Static request bodies, serialized once
+JSON_HEADERS = {"Content-Type": "application/json"}
+USER1_LOGIN = orjson.dumps({"email": "user1@example.com", "password": "password123"})
+INVALID_LOGIN = orjson.dumps({"email": "invalid@example.com", "password": "wrongpassword"})
+DUPLICATE_SIGNUP = orjson.dumps({"username": "AnotherUser", "email": "user1@example.com", "password": "password123"})
+SCORE_BODY = orjson.dumps({"score": 150, "mode": "walls"})
+NEG_SCORE_BODY = orjson.dumps({"score": -10, "mode": "walls"})
+INVALID_MODE_BODY = orjson.dumps({"score": 100, "mode": "invalid_mode"})
+MISSING_EMAIL_BODY = orjson.dumps({"password": "test"})
+
+# Clients shared by the verifiers running against each base URL, and how many
+# verifiers currently use each one
+_SESSIONS: Dict[str, httpx.AsyncClient] = {}
+_SESSION_USERS: Dict[str, int] = {}
+
+# Fields every leaderboard entry and live player must have
+LEADERBOARD_FIELDS = frozenset({"rank", "username", "score", "mode"})
+PLAYER_FIELDS = frozenset({"id", "username", "score", "status"})
+
+# Output lines and results of the suite running in the current task, when
+# suites run in parallel and have to be kept apart
+_SUITE_BUFFER: contextvars.ContextVar[Optional[Tuple[List[str], List["TestResult"]]]] = contextvars.ContextVar(
+    "suite_buffer", default=None
+)
 
 
 # Color codes for terminal output
@@ -35,7 +73,7 @@ class Colors:
     BOLD = "\033[1m"
 
 
-@dataclass
+@dataclass(slots=True)
 class TestResult:
     """Result of a single API test"""
     name: str
@@ -55,29 +93,101 @@ class TestResult:
 class APIVerifier:
     """Comprehensive API verification tool"""
 
-    def __init__(self, base_url: str = "http://localhost:8000", verbose: bool = False, use_colors: bool = True):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        verbose: bool = False,
+        use_colors: bool = True,
+        parallel: int = 1,
+        timeout: float = 60.0,
+    ):
         self.base_url = base_url.rstrip("/")
+        self._base_slash = self.base_url + "/"
         self.verbose = verbose
+        self.parallel = parallel
+        # Each suite gets an equal share of the run's time limit
+        self.timeout = timeout
         self.use_colors = use_colors
-        self.session = requests.Session()
+        self.session: Optional[httpx.AsyncClient] = None
         self.results: List[TestResult] = []
-        self.auth_token: Optional[str] = None
+        self.auth_token = None
         self.test_user_email: Optional[str] = None
+        # Log prefixes per level, built once
+        if use_colors:
+            self._prefixes = {
+                "INFO": f"{Colors.BLUE}ℹ{Colors.RESET} ",
+                "SUCCESS": f"{Colors.GREEN}✓{Colors.RESET} ",
+                "ERROR": f"{Colors.RED}✗{Colors.RESET} ",
+                "WARN": f"{Colors.YELLOW}⚠{Colors.RESET} ",
+            }
+        else:
+            self._prefixes = {"INFO": "[INFO] ", "SUCCESS": "[✓] ", "ERROR": "[✗] ", "WARN": "[⚠] "}
+        # Successful /health response from the connectivity check
+        self._health_response: Optional[httpx.Response] = None
+        self._health_elapsed: float = 0.0
+        # Output lines not yet written to stdout
+        self._output: List[str] = []
+
+    @property
+    def auth_token(self) -> Optional[str]:
+        return self._auth_token
+
+    @auth_token.setter
+    def auth_token(self, token: Optional[str]):
+        # The header is built once per token rather than per request
+        self._auth_token = token
+        self._auth_headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+    @staticmethod
+    def _build_pooled_session(base_url: str) -> httpx.AsyncClient:
+        # Keep every connection a concurrent suite opens alive for the next
+        # suite, and retry connection failures (never error statuses, which
+        # are what is being verified)
+        transport = httpx.AsyncHTTPTransport(
+            http2=HTTP2_AVAILABLE,
+            # asyncio already disables Nagle on TCP transports; don't depend on it
+            socket_options=[(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)],
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=30),
+            retries=2,
+        )
+        return httpx.AsyncClient(base_url=base_url, transport=transport)
+
+    async def __aenter__(self) -> "APIVerifier":
+        # Verifiers for the same server share one connection pool; it is
+        # closed when the last of them exits, as it cannot outlive the loop
+        if self.base_url not in _SESSIONS:
+            _SESSIONS[self.base_url] = self._build_pooled_session(self.base_url)
+        _SESSION_USERS[self.base_url] = _SESSION_USERS.get(self.base_url, 0) + 1
+        self.session = _SESSIONS[self.base_url]
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        _SESSION_USERS[self.base_url] -= 1
+        if not _SESSION_USERS[self.base_url]:
+            del _SESSION_USERS[self.base_url]
+            await _SESSIONS.pop(self.base_url).aclose()
+        self.session = None
 
     def log(self, message: str, level: str = "INFO"):
         """Log a message with optional colors"""
-        if level == "INFO":
-            prefix = f"{self._color('ℹ', Colors.BLUE)} " if self.use_colors else "[INFO] "
-        elif level == "SUCCESS":
-            prefix = f"{self._color('✓', Colors.GREEN)} " if self.use_colors else "[✓] "
-        elif level == "ERROR":
-            prefix = f"{self._color('✗', Colors.RED)} " if self.use_colors else "[✗] "
-        elif level == "WARN":
-            prefix = f"{self._color('⚠', Colors.YELLOW)} " if self.use_colors else "[⚠] "
-        else:
-            prefix = ""
+        self._out_buffer.append(self._prefixes.get(level, "") + message)
+
+    @property
+    def _out_buffer(self) -> List[str]:
+        buffer = _SUITE_BUFFER.get()
+        return self._output if buffer is None else buffer[0]
+
+    @property
+    def _results_buffer(self) -> List[TestResult]:
+        buffer = _SUITE_BUFFER.get()
+        return self.results if buffer is None else buffer[1]
 
-        print(prefix + message)
+    def _flush(self):
+        """Write buffered output to stdout in one call"""
+        if self._out_buffer:
+            sys.stdout.write("\n".join(self._out_buffer) + "\n")
+            sys.stdout.flush()
+            self._out_buffer.clear()
 
     def _color(self, text: str, color: str) -> str:
         """Apply color to text if colors are enabled"""
@@ -85,12 +195,17 @@ class APIVerifier:
             return text
         return f"{color}{text}{Colors.RESET}"
 
-    def _check_connectivity(self) -> bool:
+    async def _check_connectivity(self) -> bool:
         """Check if the API server is reachable"""
         try:
-            response = self.session.get(f"{self.base_url}/health", timeout=5)
-            return response.status_code == 200
-        except requests.exceptions.ConnectionError:
+            start_time = time.perf_counter()
+            response = await self.session.get("/health", timeout=5)
+            if response.status_code != 200:
+                return False
+            self._health_response = response
+            self._health_elapsed = time.perf_counter() - start_time
+            return True
+        except httpx.ConnectError:
             self.log(f"Cannot connect to {self.base_url}", "ERROR")
             return False
         except Exception as e:
@@ -98,82 +213,101 @@ class APIVerifier:
             return False
 
     def _url(self, endpoint: str) -> str:
-        """Build full URL for an endpoint"""
-        return urljoin(self.base_url + "/", endpoint.lstrip("/"))
+        """Build full URL for an endpoint (for logging; the client joins its base_url)"""
+        return self._base_slash + endpoint.lstrip("/")
 
-    def _make_request(
-        self, method: str, endpoint: str, **kwargs
-    ) -> Tuple[Optional[requests.Response], Optional[float]]:
+    async def _make_request(
+        self, method: str, endpoint: str, authenticated: bool = True, **kwargs
+    ) -> Tuple[Optional[httpx.Response], Optional[float]]:
         """Make HTTP request and measure response time"""
         try:
-            url = self._url(endpoint)
             if self.verbose:
-                self.log(f"Request: {method} {url}", "INFO")
+                self.log(f"Request: {method} {self._url(endpoint)}", "INFO")
             
-            # Add auth header if token exists
-            if self.auth_token and "headers" not in kwargs:
-                kwargs["headers"] = {}
-            if self.auth_token:
-                kwargs.setdefault("headers", {})["Authorization"] = f"Bearer {self.auth_token}"
+            # Fresh dict per request; the caller's headers are never modified
+            headers = kwargs.pop("headers", {})
+            if authenticated:
+                headers = {**self._auth_headers, **headers}
 
-            start_time = datetime.now()
-            response = self.session.request(method, url, timeout=10, **kwargs)
-            elapsed = (datetime.now() - start_time).total_seconds()
+            # Encode JSON bodies with orjson rather than httpx's json.dumps
+            if "json" in kwargs:
+                kwargs["content"] = orjson.dumps(kwargs.pop("json"))
+                headers = {"Content-Type": "application/json", **headers}
+
+            start_time = time.perf_counter()
+            response = await self.session.request(method, endpoint, headers=headers, timeout=10, **kwargs)
+            elapsed = time.perf_counter() - start_time
 
             if self.verbose:
                 self.log(f"Response: {response.status_code} ({elapsed:.3f}s)", "INFO")
 
             return response, elapsed
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             self.log(f"Request timeout: {endpoint}", "ERROR")
             return None, None
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             self.log(f"Request failed: {e}", "ERROR")
             return None, None
 
-    def _test(
-        self,
-        name: str,
-        method: str,
-        endpoint: str,
-        expected_status: int,
-        **kwargs
-    ) -> TestResult:
-        """Execute a single test"""
-        response, elapsed = self._make_request(method, endpoint, **kwargs)
-
+    def _new_result(self, name: str, method: str, endpoint: str, expected_status: Optional[int]) -> TestResult:
+        """Record a pending test result"""
         result = TestResult(
             name=name,
             endpoint=endpoint,
             method=method,
+            status="FAIL",
             expected_status=expected_status,
-            response_time=elapsed or 0,
         )
+        # Recorded up front so concurrent tests keep their issue order
+        self._results_buffer.append(result)
+        return result
 
-        if response is None:
-            result.status = "FAIL"
-            result.error_message = "No response received"
-            return result
-
+    def _check_response(
+        self, result: TestResult, response: httpx.Response, elapsed: float, skip_body: bool = False
+    ) -> TestResult:
+        """Fill in a test result from its response"""
+        expected_status = result.expected_status
+        result.response_time = elapsed
         result.status_code = response.status_code
+        if not skip_body:
+            try:
+                result.details = orjson.loads(response.content)
+            except orjson.JSONDecodeError:
+                result.details = {"raw": response.text}
 
         if response.status_code == expected_status:
             result.status = "PASS"
-            try:
-                result.details = response.json()
-            except:
-                result.details = {"raw": response.text}
         else:
-            result.status = "FAIL"
             result.error_message = f"Expected {expected_status}, got {response.status_code}"
-            try:
-                result.details = response.json()
-            except:
-                result.details = {"raw": response.text}
 
-        self.results.append(result)
         return result
 
+    async def _test(
+        self,
+        name: str,
+        method: str,
+        endpoint: str,
+        expected_status: int,
+        skip_body: bool = False,
+        **kwargs
+    ) -> TestResult:
+        """Execute a single test (skip_body: only the status code is checked)"""
+        result = self._new_result(name, method, endpoint, expected_status)
+
+        response, elapsed = await self._make_request(method, endpoint, **kwargs)
+        if response is None:
+            result.error_message = "No response received"
+            return result
+
+        return self._check_response(result, response, elapsed, skip_body)
+
+    async def _test_concurrently(self, *tests) -> List[TestResult]:
+        """Run independent tests concurrently and print their results in order"""
+        results = await asyncio.gather(*tests)
+        for result in results:
+            self._print_result(result)
+        return results
+
     def _print_result(self, result: TestResult):
         """Print a single test result"""
         if result.status == "PASS":
@@ -184,40 +318,47 @@ class APIVerifier:
             status_str = self._color("FAIL", Colors.RED)
 
         time_str = f"{result.response_time:.3f}s" if result.response_time else "N/A"
-        print(f"  [{status_str}] {result.name} ({result.method} {result.endpoint}) - {time_str}")
+        self._out_buffer.append(f"  [{status_str}] {result.name} ({result.method} {result.endpoint}) - {time_str}")
 
         if result.status == "FAIL" and result.error_message:
-            print(f"       {self._color(result.error_message, Colors.RED)}")
+            self._out_buffer.append(f"       {self._color(result.error_message, Colors.RED)}")
 
     # ===================== HEALTH CHECKS =====================
 
-    def test_health_checks(self):
+    async def test_health_checks(self):
         """Test health check endpoints"""
         self.log("\n🏥 Testing Health Checks", "INFO")
-        print("-" * 70)
-
-        result = self._test("Health Check", "GET", "/health", 200)
-        self._print_result(result)
+        self._out_buffer.append("-" * 70)
 
-        result = self._test("Root Endpoint", "GET", "/", 200)
-        self._print_result(result)
+        if self._health_response is not None:
+            # The connectivity check already fetched /health
+            result = self._new_result("Health Check", "GET", "/health", 200)
+            self._check_response(result, self._health_response, self._health_elapsed)
+            self._print_result(result)
+            await self._test_concurrently(self._test("Root Endpoint", "GET", "/", 200))
+        else:
+            await self._test_concurrently(
+                self._test("Health Check", "GET", "/health", 200),
+                self._test("Root Endpoint", "GET", "/", 200),
+            )
 
     # ===================== AUTHENTICATION =====================
 
-    def test_authentication(self):
+    async def test_authentication(self):
         """Test authentication endpoints"""
         self.log("\n🔐 Testing Authentication", "INFO")
-        print("-" * 70)
+        self._out_buffer.append("-" * 70)
 
         # Signup
-        signup_email = f"testuser_{int(datetime.now().timestamp())}@example.com"
-        result = self._test(
+        suffix = secrets.token_hex(4)
+        signup_email = f"testuser_{suffix}@example.com"
+        result = await self._test(
             "Signup",
             "POST",
             "/auth/signup",
             201,
             json={
-                "username": "TestUser",
+                "username": f"TestUser_{suffix}",
                 "email": signup_email,
                 "password": "TestPassword123",
             },
@@ -230,15 +371,13 @@ class APIVerifier:
             self.log(f"Got auth token: {self.auth_token[:20]}...", "SUCCESS")
 
         # Login
-        result = self._test(
+        result = await self._test(
             "Login",
             "POST",
             "/auth/login",
             200,
-            json={
-                "email": "user1@example.com",
-                "password": "password123",
-            },
+            content=USER1_LOGIN,
+            headers=JSON_HEADERS,
         )
         self._print_result(result)
 
@@ -248,156 +387,145 @@ class APIVerifier:
 
         # Get Current User (requires auth)
         if self.auth_token:
-            result = self._test("Get Current User", "GET", "/auth/me", 200)
+            result = await self._test("Get Current User", "GET", "/auth/me", 200)
             self._print_result(result)
 
             # Logout
-            result = self._test("Logout", "POST", "/auth/logout", 200)
+            result = await self._test("Logout", "POST", "/auth/logout", 200)
             self._print_result(result)
 
-        # Invalid login
-        result = self._test(
-            "Login Invalid Credentials",
-            "POST",
-            "/auth/login",
-            401,
-            json={
-                "email": "invalid@example.com",
-                "password": "wrongpassword",
-            },
-        )
-        self._print_result(result)
-
-        # Signup duplicate email
-        result = self._test(
-            "Signup Duplicate Email",
-            "POST",
-            "/auth/signup",
-            400,
-            json={
-                "username": "AnotherUser",
-                "email": "user1@example.com",
-                "password": "password123",
-            },
+        await self._test_concurrently(
+            # Invalid login
+            self._test(
+                "Login Invalid Credentials",
+                "POST",
+                "/auth/login",
+                401,
+                content=INVALID_LOGIN,
+                headers=JSON_HEADERS,
+                skip_body=True,
+            ),
+            # Signup duplicate email
+            self._test(
+                "Signup Duplicate Email",
+                "POST",
+                "/auth/signup",
+                400,
+                content=DUPLICATE_SIGNUP,
+                headers=JSON_HEADERS,
+                skip_body=True,
+            ),
         )
-        self._print_result(result)
 
     # ===================== LEADERBOARD =====================
 
-    def test_leaderboard(self):
+    async def test_leaderboard(self):
         """Test leaderboard endpoints"""
         self.log("\n🏆 Testing Leaderboard", "INFO")
-        print("-" * 70)
-
-        # Get leaderboard
-        result = self._test("Get Leaderboard", "GET", "/leaderboard", 200)
-        self._print_result(result)
+        self._out_buffer.append("-" * 70)
+
+        result, _ = await self._test_concurrently(
+            # Get leaderboard
+            self._test("Get Leaderboard", "GET", "/leaderboard", 200),
+            # Get leaderboard filtered by mode
+            self._test(
+                "Get Leaderboard (walls mode)",
+                "GET",
+                "/leaderboard?mode=walls",
+                200,
+            ),
+        )
 
         # Validate leaderboard structure
         if result.status == "PASS":
-            data = result.details.get("data", [])
+            data = result.details.get("data", {}).get("entries", [])
             if isinstance(data, list) and len(data) > 0:
-                entry = data[0]
-                required_fields = ["rank", "username", "score", "mode"]
-                missing = [f for f in required_fields if f not in entry]
+                missing = set().union(*(LEADERBOARD_FIELDS.difference(entry) for entry in data))
                 if missing:
-                    self.log(f"Leaderboard entry missing fields: {missing}", "WARN")
+                    self.log(f"Leaderboard entry missing fields: {sorted(missing)}", "WARN")
                 else:
                     self.log(f"Leaderboard has {len(data)} entries", "SUCCESS")
 
-        # Get leaderboard filtered by mode
-        result = self._test(
-            "Get Leaderboard (walls mode)",
-            "GET",
-            "/leaderboard?mode=walls",
-            200,
-        )
-        self._print_result(result)
-
         # Re-authenticate for protected endpoints
-        login_result = self._test(
+        login_result = await self._test(
             "[Setup] Login for submit test",
             "POST",
             "/auth/login",
             200,
-            json={
-                "email": "user1@example.com",
-                "password": "password123",
-            },
+            content=USER1_LOGIN,
+            headers=JSON_HEADERS,
         )
         if login_result.status == "PASS":
             self.auth_token = login_result.details.get("data", {}).get("access_token")
 
         # Submit score (protected)
         if self.auth_token:
-            result = self._test(
-                "Submit Score",
-                "POST",
-                "/leaderboard/submit",
-                200,
-                json={
-                    "score": 150,
-                    "mode": "walls",
-                },
-            )
-            self._print_result(result)
-
-            # Submit invalid score
-            result = self._test(
-                "Submit Invalid Score (negative)",
-                "POST",
-                "/leaderboard/submit",
-                400,
-                json={
-                    "score": -10,
-                    "mode": "walls",
-                },
+            await self._test_concurrently(
+                self._test(
+                    "Submit Score",
+                    "POST",
+                    "/leaderboard/submit",
+                    200,
+                    content=SCORE_BODY,
+                    headers=JSON_HEADERS,
+                ),
+                # Submit invalid score
+                self._test(
+                    "Submit Invalid Score (negative)",
+                    "POST",
+                    "/leaderboard/submit",
+                    400,
+                    content=NEG_SCORE_BODY,
+                    headers=JSON_HEADERS,
+                    skip_body=True,
+                ),
+                # Submit invalid mode
+                self._test(
+                    "Submit Invalid Mode",
+                    "POST",
+                    "/leaderboard/submit",
+                    400,
+                    content=INVALID_MODE_BODY,
+                    headers=JSON_HEADERS,
+                    skip_body=True,
+                ),
             )
-            self._print_result(result)
-
-            # Submit invalid mode
-            result = self._test(
-                "Submit Invalid Mode",
-                "POST",
-                "/leaderboard/submit",
-                400,
-                json={
-                    "score": 100,
-                    "mode": "invalid_mode",
-                },
-            )
-            self._print_result(result)
 
     # ===================== LIVE PLAYERS =====================
 
-    def test_live_players(self):
+    async def test_live_players(self):
         """Test live players endpoints"""
         self.log("\n👥 Testing Live Players", "INFO")
-        print("-" * 70)
-
-        # Get live players
-        result = self._test("Get Live Players", "GET", "/live/players", 200)
-        self._print_result(result)
+        self._out_buffer.append("-" * 70)
+
+        result, _ = await self._test_concurrently(
+            # Get live players
+            self._test("Get Live Players", "GET", "/live/players", 200),
+            # Get non-existent player
+            self._test(
+                "Get Non-existent Player",
+                "GET",
+                "/live/players/invalid-player-id",
+                404,
+            ),
+        )
 
         # Validate live players structure
         if result.status == "PASS":
-            data = result.details.get("data", [])
+            data = result.details.get("data", {}).get("players", [])
             if isinstance(data, list):
                 self.log(f"Found {len(data)} live players", "SUCCESS")
-                if len(data) > 0:
-                    player = data[0]
-                    required_fields = ["id", "username", "score", "status"]
-                    missing = [f for f in required_fields if f not in player]
-                    if missing:
-                        self.log(f"Player entry missing fields: {missing}", "WARN")
+                missing = set().union(*(PLAYER_FIELDS.difference(player) for player in data))
+                if missing:
+                    self.log(f"Player entry missing fields: {sorted(missing)}", "WARN")
 
         # Get specific player (use first player if available)
         if result.status == "PASS":
-            data = result.details.get("data", [])
+            data = result.details.get("data", {}).get("players", [])
             if len(data) > 0:
                 player_id = data[0].get("id")
                 if player_id:
-                    result = self._test(
+                    result = await self._test(
                         f"Get Live Player Details",
                         "GET",
                         f"/live/players/{player_id}",
@@ -405,58 +533,44 @@ class APIVerifier:
                     )
                     self._print_result(result)
 
-        # Get non-existent player
-        result = self._test(
-            "Get Non-existent Player",
-            "GET",
-            "/live/players/invalid-player-id",
-            404,
-        )
-        self._print_result(result)
-
     # ===================== SECURITY & VALIDATION =====================
 
-    def test_security(self):
+    async def test_security(self):
         """Test security and validation"""
         self.log("\n🔒 Testing Security & Validation", "INFO")
-        print("-" * 70)
-
-        # Missing required fields
-        result = self._test(
-            "Login Missing Email",
-            "POST",
-            "/auth/login",
-            422,
-            json={"password": "test"},
-        )
-        self._print_result(result)
-
-        # Invalid JSON
-        result = self._test(
-            "Invalid JSON Body",
-            "POST",
-            "/auth/login",
-            422,
-            data="invalid json",
-            headers={"Content-Type": "application/json"},
-        )
-        self._print_result(result)
-
-        # Protected endpoint without auth
-        # First, clear the auth token
-        original_token = self.auth_token
-        self.auth_token = None
+        self._out_buffer.append("-" * 70)
 
-        result = self._test(
-            "Protected Endpoint No Auth",
-            "GET",
-            "/auth/me",
-            403,
+        await self._test_concurrently(
+            # Missing required fields
+            self._test(
+                "Login Missing Email",
+                "POST",
+                "/auth/login",
+                422,
+                content=MISSING_EMAIL_BODY,
+                headers=JSON_HEADERS,
+                skip_body=True,
+            ),
+            # Invalid JSON
+            self._test(
+                "Invalid JSON Body",
+                "POST",
+                "/auth/login",
+                422,
+                content="invalid json",
+                headers=JSON_HEADERS,
+                skip_body=True,
+            ),
+            # Protected endpoint without auth
+            self._test(
+                "Protected Endpoint No Auth",
+                "GET",
+                "/auth/me",
+                403,
+                authenticated=False,
+                skip_body=True,
+            ),
         )
-        self._print_result(result)
-
-        # Restore token
-        self.auth_token = original_token
 
     # ===================== SUMMARY & REPORTING =====================
 
@@ -471,49 +585,106 @@ class APIVerifier:
         self.log("📊 Test Summary", "INFO")
         self.log("=" * 70, "INFO")
 
-        print(f"\nTotal Tests:  {total}")
-        print(f"  {self._color(f'✓ Passed: {passed}', Colors.GREEN)}")
-        print(f"  {self._color(f'✗ Failed: {failed}', Colors.RED)}")
+        lines = self._out_buffer
+        lines.append(f"\nTotal Tests:  {total}")
+        lines.append(f"  {self._color(f'✓ Passed: {passed}', Colors.GREEN)}")
+        lines.append(f"  {self._color(f'✗ Failed: {failed}', Colors.RED)}")
         if skipped:
-            print(f"  {self._color(f'⊘ Skipped: {skipped}', Colors.YELLOW)}")
+            lines.append(f"  {self._color(f'⊘ Skipped: {skipped}', Colors.YELLOW)}")
 
         pass_rate = (passed / total * 100) if total > 0 else 0
-        print(f"\n  Pass Rate: {pass_rate:.1f}%")
+        lines.append(f"\n  Pass Rate: {pass_rate:.1f}%")
 
         if failed > 0:
-            print(f"\n{self._color('Failed Tests:', Colors.RED)}")
+            lines.append(f"\n{self._color('Failed Tests:', Colors.RED)}")
             for result in self.results:
                 if result.status == "FAIL":
-                    print(f"  • {result.name}: {result.error_message}")
+                    lines.append(f"  • {result.name}: {result.error_message}")
 
-        print("\n" + "=" * 70)
+        lines.append("\n" + "=" * 70)
+        self._flush()
 
         return failed == 0
 
-    def run_all_tests(self):
+    async def _run_suite(self, suite, deadline: float):
+        """Run a suite within its deadline, failing the tests it did not finish"""
+        results = self._results_buffer
+        start = len(results)
+        try:
+            await asyncio.wait_for(suite(), deadline)
+        except asyncio.TimeoutError:
+            self.log(f"Suite timed out after {deadline:.1f}s", "ERROR")
+            for result in results[start:]:
+                if result.status_code is None and not result.error_message:
+                    result.error_message = "Timed out"
+                    self._print_result(result)
+            # Stands in for the tests the suite never got to start
+            result = self._new_result(f"{suite.__name__} (remaining tests)", "-", "-", None)
+            result.error_message = f"Suite did not finish within {deadline:.1f}s"
+            self._print_result(result)
+
+    async def _run_buffered(
+        self, suite, deadline: float, limit: asyncio.Semaphore
+    ) -> Tuple[List[str], List[TestResult]]:
+        """Run a suite, returning its output lines and results instead of recording them"""
+        buffer: Tuple[List[str], List[TestResult]] = ([], [])
+        token = _SUITE_BUFFER.set(buffer)
+        try:
+            async with limit:
+                await self._run_suite(suite, deadline)
+        finally:
+            _SUITE_BUFFER.reset(token)
+        return buffer
+
+    async def _run_suites_in_parallel(self, suites, deadline: float):
+        """Run suites up to `parallel` at a time, reporting them in order"""
+        limit = asyncio.Semaphore(self.parallel)
+        # Authentication changes the shared token, so it runs on its own first;
+        # the other suites log in themselves if they need to
+        auth_buffer = await self._run_buffered(self.test_authentication, deadline, limit)
+        others = [suite for suite in suites if suite != self.test_authentication]
+        buffers = dict(zip(others, await asyncio.gather(*(self._run_buffered(s, deadline, limit) for s in others))))
+        buffers[self.test_authentication] = auth_buffer
+        for suite in suites:
+            lines, results = buffers[suite]
+            self._output.extend(lines)
+            self.results.extend(results)
+            self._flush()
+
+    async def run_all_tests(self):
         """Run all test suites"""
         self.log("🚀 Starting API Verification", "INFO")
         self.log(f"Target: {self.base_url}\n", "INFO")
 
         # Check connectivity
-        if not self._check_connectivity():
+        if not await self._check_connectivity():
             self.log("Server is not reachable. Aborting.", "ERROR")
+            self._flush()
             return False
 
         self.log("✓ Server is reachable", "SUCCESS")
 
         # Run test suites
+        # Tests within a suite that do not depend on each other run
+        # concurrently. Output is written once per suite.
+        suites = [
+            self.test_health_checks,
+            self.test_authentication,
+            self.test_leaderboard,
+            self.test_live_players,
+            self.test_security,
+        ]
+        deadline = self.timeout / len(suites)
         try:
-            self.test_health_checks()
-            self.test_authentication()
-            self.test_leaderboard()
-            self.test_live_players()
-            self.test_security()
-        except KeyboardInterrupt:
-            self.log("\nTests interrupted by user", "WARN")
-            return False
+            if self.parallel > 1:
+                await self._run_suites_in_parallel(suites, deadline)
+            else:
+                for suite in suites:
+                    await self._run_suite(suite, deadline)
+                    self._flush()
         except Exception as e:
             self.log(f"Unexpected error: {e}", "ERROR")
+            self._flush()
             if self.verbose:
                 import traceback
                 traceback.print_exc()
@@ -534,6 +705,8 @@ Examples:
   python verify_api.py --url http://localhost:8000
   python verify_api.py --verbose
   python verify_api.py --no-color
+  python verify_api.py --parallel 4
+  python verify_api.py --timeout 30
         """,
     )
 
@@ -552,6 +725,20 @@ Examples:
         action="store_true",
         help="Disable colored output",
     )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Run up to N test suites at once (default: 1)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=60.0,
+        metavar="SECONDS",
+        help="Time limit for the whole run (default: 60)",
+    )
 
     args = parser.parse_args()
 
@@ -559,9 +746,26 @@ Examples:
         base_url=args.url,
         verbose=args.verbose,
         use_colors=not args.no_color,
+        parallel=args.parallel,
+        timeout=args.timeout,
     )
 
-    success = verifier.run_all_tests()
+    async def run() -> bool:
+        async with verifier:
+            # Suites keep to their deadlines; this bounds the connectivity
+            # check and the rest of the run as well
+            return await asyncio.wait_for(verifier.run_all_tests(), args.timeout + 10)
+
+    try:
+        success = asyncio.run(run())
+    except asyncio.TimeoutError:
+        verifier.log(f"Verification did not finish within {args.timeout:.0f}s", "ERROR")
+        verifier._flush()
+        success = False
+    except KeyboardInterrupt:
+        verifier.log("\nTests interrupted by user", "WARN")
+        verifier._flush()
+        success = False
     sys.exit(0 if success else 1)
 
 